@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 import calendar
+import faulthandler
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from html import unescape
+from itertools import takewhile
 from typing import Any
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse, parse_qsl, urlsplit, urlunsplit
 import hashlib
+import math
+import multiprocessing
 import re
+import signal
+import threading
+import time
+import uuid
 
 import feedparser
 import requests
@@ -16,9 +27,21 @@ import trafilatura
 from .ai.image_caption import caption_image
 from .config import get_settings
 from .db import get_supabase
+from .http_cache import cache_get, cache_key, cache_put
+from .http_client import get_session
+from .near_dupe import annotate_rows
+from .project_cache import get_project, invalidate_project
+from .rate_limit import get_limiter
+from .stage_events import stage_done
+from .stage_metrics import submit
 
 MAX_CONTENT_CHARS = 4000
 
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+_extract_pool: ProcessPoolExecutor | None = None
+_extract_pool_lock = threading.Lock()
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -84,6 +107,37 @@ def _looks_like_media(url: str) -> bool:
     return path.endswith((".jpg", ".jpeg", ".png", ".gif", ".webp", ".mp4", ".mov", ".webm"))
 
 
+def _host_key(url: str) -> str:
+    return (urlparse(url).netloc or "").lower()
+
+
+@contextmanager
+def _host_slot(url: str):
+    # Caps simultaneous requests per host so a concurrent scrape cannot hammer one site.
+    key = _host_key(url)
+    with _host_slots_lock:
+        slot = _host_slots.get(key)
+        if slot is None:
+            size = max(1, get_settings().scrape_per_host_concurrency)
+            slot = threading.BoundedSemaphore(size)
+            _host_slots[key] = slot
+    with slot:
+        yield
+
+
+def _http_get(url: str, **kwargs: Any) -> requests.Response:
+    limiter = get_limiter()
+    limiter.acquire(url)
+    try:
+        with _host_slot(url):
+            resp = get_session().get(url, **kwargs)
+    except requests.RequestException:
+        limiter.record(url, None)
+        raise
+    limiter.record(url, resp.status_code, resp.headers.get("Retry-After"))
+    return resp
+
+
 def _request_kwargs(settings: Any, config: dict | None, accept: str | None = None) -> dict:
     headers = {"User-Agent": settings.user_agent}
     if accept:
@@ -108,6 +162,24 @@ def _request_kwargs(settings: Any, config: dict | None, accept: str | None = Non
     return {"headers": headers, "timeout": settings.request_timeout, "auth": auth}
 
 
+def _conditional_headers(validators: dict | None) -> dict:
+    headers: dict[str, str] = {}
+    if not validators:
+        return headers
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _store_validators(validators: dict | None, resp: requests.Response) -> None:
+    if validators is None:
+        return
+    validators["etag"] = resp.headers.get("ETag")
+    validators["last_modified"] = resp.headers.get("Last-Modified")
+
+
 def _detect_login_required(
     html: str | None,
     extracted: str | None,
@@ -229,6 +301,104 @@ def _extract_reddit_image_url(post: dict) -> str | None:
     return None
 
 
+def _article_cache_key(url: str, config: dict | None) -> str:
+    parts = [_normalize_article_url(url)]
+    if config and config.get("auth_required"):
+        # Authenticated fetches can see different content than anonymous ones.
+        auth = {k: v for k, v in config.items() if k.startswith("auth_") and not k.startswith("auth_last")}
+        parts.append(repr(sorted(auth.items())))
+    return cache_key(*parts)
+
+
+def _extract_article_html(html: str, status_code: int, url: str) -> tuple[str, str | None]:
+    # Module-level so it can run in the extraction process pool.
+    extracted = trafilatura.extract(html, include_comments=False, include_tables=False) or ""
+    return extracted.strip(), _detect_login_required(html, extracted, status_code, url=url)
+
+
+def _extract_in_worker(html: str, status_code: int, url: str, timeout: float) -> tuple[str, str | None]:
+    # Runs in the extract process, so the deadline starts when the task starts rather than
+    # when it was queued behind other pages.
+    def _expired(signum: int, frame: Any) -> None:
+        raise TimeoutError(f"extraction exceeded {timeout}s")
+
+    alarm = hasattr(signal, "setitimer")
+    if alarm:
+        previous = signal.signal(signal.SIGALRM, _expired)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    # Backstop for a call stuck in C code that never returns to the interpreter: end this
+    # worker; the parent sees BrokenProcessPool and starts a fresh pool.
+    faulthandler.dump_traceback_later(timeout * 2, exit=True)
+    try:
+        return _extract_article_html(html, status_code, url)
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def _get_extract_pool() -> ProcessPoolExecutor | None:
+    global _extract_pool
+    workers = get_settings().ingest_extract_workers
+    if workers <= 0:
+        return None
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            # spawn: forking a process that already runs fetch threads can deadlock.
+            _extract_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _extract_pool
+
+
+def _recycle_extract_pool(pool: ProcessPoolExecutor) -> None:
+    # Called once a worker died on a hung task; the executor already terminated the rest
+    # of the broken pool, so only replace it.
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is pool:
+            _extract_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _fetch_article(
+    url: str,
+    settings: Any,
+    config: dict | None = None,
+    use_extract_pool: bool = False,
+) -> dict:
+    # Download + trafilatura once per URL per cache TTL; scrape, ingest and access checks share it.
+    key = _article_cache_key(url, config)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+    kwargs = _request_kwargs(settings, config, accept="text/html")
+    resp = _http_get(url, **kwargs)
+    result: dict = {"status_code": resp.status_code, "extracted": "", "reason": None}
+    if resp.status_code in {401, 403}:
+        result["reason"] = f"http_{resp.status_code}"
+    elif resp.ok:
+        extract_pool = _get_extract_pool() if use_extract_pool else None
+        if extract_pool is not None:
+            future = extract_pool.submit(
+                _extract_in_worker, resp.text, resp.status_code, url, settings.ingest_item_timeout
+            )
+            try:
+                # Bounded by the worker's own deadline, so queueing time is not counted here.
+                extracted, reason = future.result()
+            except BrokenProcessPool:
+                _recycle_extract_pool(extract_pool)
+                raise
+        else:
+            extracted, reason = _extract_article_html(resp.text, resp.status_code, url)
+        result["extracted"] = extracted
+        result["reason"] = reason
+    if resp.status_code < 500 and resp.status_code != 429:
+        cache_put(key, result)
+    return result
+
+
 def _fetch_article_text(
     url: str,
     settings: Any,
@@ -241,20 +411,15 @@ def _fetch_article_text(
     if "reddit.com" in urlparse(url).netloc:
         return ""
     try:
-        kwargs = _request_kwargs(settings, config, accept="text/html")
-        resp = requests.get(url, **kwargs)
-        if resp.status_code in {401, 403}:
-            if sb is not None:
-                _mark_auth_required(sb, source_id, config, f"http_{resp.status_code}")
-            return ""
-        resp.raise_for_status()
-        extracted = trafilatura.extract(resp.text) or ""
-        reason = _detect_login_required(resp.text, extracted, resp.status_code, url=url)
-        if reason and sb is not None:
-            _mark_auth_required(sb, source_id, config, reason)
-        return extracted
+        result = _fetch_article(url, settings, config=config)
     except Exception:
         return ""
+    reason = result.get("reason")
+    if reason and sb is not None:
+        _mark_auth_required(sb, source_id, config, reason)
+    if result.get("status_code") in {401, 403}:
+        return ""
+    return result.get("extracted") or ""
 
 
 def list_projects() -> list[dict]:
@@ -315,47 +480,21 @@ def update_project(project_id: str, fields: dict) -> dict:
         payload["podcast_image_prompt"] = cleaned or None
     payload["updated_at"] = _now_iso()
     res = sb.table("projects").update(payload).eq("id", project_id).execute()
+    invalidate_project(project_id)
     return (res.data or [payload])[0]
 
 
 def get_project_podcast_image_prompt(project_id: str) -> str | None:
-    sb = get_supabase()
-    resp = (
-        sb.table("projects")
-        .select("podcast_image_prompt")
-        .eq("id", project_id)
-        .limit(1)
-        .execute()
-    )
-    data = resp.data or []
-    if not data:
+    row = get_project(project_id)
+    if not row:
         return None
-    return data[0].get("podcast_image_prompt")
+    return row.get("podcast_image_prompt")
 
 
 def resolve_project_id_for_post(post_id: str) -> str | None:
     sb = get_supabase()
-    usage = (
-        sb.table("article_usage")
-        .select("article_id")
-        .eq("post_id", post_id)
-        .limit(1)
-        .execute()
-    )
-    usage_rows = usage.data or []
-    if not usage_rows:
-        return None
-    article_id = usage_rows[0].get("article_id")
-    if not article_id:
-        return None
-    article = (
-        sb.table("articles")
-        .select("project_id")
-        .eq("id", article_id)
-        .limit(1)
-        .execute()
-    )
-    rows = article.data or []
+    resp = sb.table("posts").select("project_id").eq("id", post_id).limit(1).execute()
+    rows = resp.data or []
     if not rows:
         return None
     return rows[0].get("project_id")
@@ -364,6 +503,7 @@ def resolve_project_id_for_post(post_id: str) -> str | None:
 def delete_project(project_id: str) -> None:
     sb = get_supabase()
     sb.table("projects").delete().eq("id", project_id).execute()
+    invalidate_project(project_id)
 
 
 def list_sources(project_id: str) -> list[dict]:
@@ -411,6 +551,10 @@ def update_source(source_id: str, fields: dict) -> dict:
         payload["name"] = payload["name"].strip()
     if "url" in payload and payload["url"]:
         payload["url"] = payload["url"].strip()
+    if "url" in payload or "config" in payload:
+        # Validators belong to the old URL/auth; force a full download next run.
+        payload["http_etag"] = None
+        payload["http_last_modified"] = None
     payload["updated_at"] = _now_iso()
     res = sb.table("sources").update(payload).eq("id", source_id).execute()
     return (res.data or [payload])[0]
@@ -486,7 +630,7 @@ def list_articles_page(
     return {"items": items, "total": total}
 
 
-def _chunked(values: list[str], size: int = 200) -> list[list[str]]:
+def _chunked(values: list, size: int = 200) -> list[list]:
     return [values[i : i + size] for i in range(0, len(values), size)]
 
 
@@ -564,6 +708,7 @@ def project_stats(project_id: str) -> dict:
     youtube_metrics = project_youtube_metrics(project_id)
     youtube_video_metrics = project_youtube_video_metrics(project_id)
     voice_stats = project_voice_stats(project_id)
+    pipeline_stages = project_pipeline_stage_stats(project_id)
     account = get_youtube_account(project_id)
     return {
         "project_id": project_id,
@@ -571,6 +716,7 @@ def project_stats(project_id: str) -> dict:
         "youtube_metrics": youtube_metrics,
         "youtube_video_metrics": youtube_video_metrics,
         "voice_stats": voice_stats,
+        "pipeline_stages": pipeline_stages,
         "youtube_channel_title": account.get("channel_title") if account else None,
     }
 
@@ -668,6 +814,71 @@ def project_youtube_video_metrics(project_id: str, limit: int = 100) -> list[dic
     return rows
 
 
+def project_pipeline_stage_stats(project_id: str, runs: int = 20) -> list[dict]:
+    # Per-stage averages over the latest runs, plus the most recent run for spotting regressions.
+    sb = get_supabase()
+    try:
+        run_rows = (
+            sb.table("pipeline_runs")
+            .select("id, started_at")
+            .eq("project_id", project_id)
+            .order("started_at", desc=True)
+            .limit(runs)
+            .execute()
+            .data
+            or []
+        )
+        run_ids = [row["id"] for row in run_rows if row.get("id")]
+        if not run_ids:
+            return []
+        stage_rows = (
+            sb.table("pipeline_stage_runs")
+            .select("run_id, stage, items, duration_ms, http_calls, llm_calls, tokens_in, tokens_out, errors")
+            .in_("run_id", run_ids)
+            .execute()
+            .data
+            or []
+        )
+    except Exception:
+        return []
+    latest_run = run_ids[0]
+    grouped: dict[str, dict] = {}
+    for row in stage_rows:
+        entry = grouped.setdefault(
+            row.get("stage") or "unknown",
+            {"runs": 0, "items": 0, "duration_ms": 0, "max_ms": 0, "http_calls": 0, "llm_calls": 0,
+             "tokens_in": 0, "tokens_out": 0, "errors": 0, "last_ms": None},
+        )
+        duration = int(row.get("duration_ms") or 0)
+        entry["runs"] += 1
+        entry["duration_ms"] += duration
+        entry["max_ms"] = max(entry["max_ms"], duration)
+        for key in ("items", "http_calls", "llm_calls", "tokens_in", "tokens_out", "errors"):
+            entry[key] += int(row.get(key) or 0)
+        if row.get("run_id") == latest_run:
+            entry["last_ms"] = duration
+    results = []
+    for name, entry in grouped.items():
+        count = entry["runs"] or 1
+        results.append(
+            {
+                "stage": name,
+                "runs": entry["runs"],
+                "avg_ms": round(entry["duration_ms"] / count),
+                "max_ms": entry["max_ms"],
+                "last_ms": entry["last_ms"],
+                "avg_items": round(entry["items"] / count, 1),
+                "avg_http_calls": round(entry["http_calls"] / count, 1),
+                "avg_llm_calls": round(entry["llm_calls"] / count, 1),
+                "avg_tokens_in": round(entry["tokens_in"] / count),
+                "avg_tokens_out": round(entry["tokens_out"] / count),
+                "errors": entry["errors"],
+            }
+        )
+    results.sort(key=lambda r: r["avg_ms"], reverse=True)
+    return results
+
+
 def project_voice_stats(project_id: str, checkpoint: str = "24h") -> list[dict]:
     sb = get_supabase()
     try:
@@ -795,20 +1006,31 @@ class ScrapeResult:
 
 
 def scrape_project(project_id: str, max_items: int = 10) -> list[ScrapeResult]:
+    settings = get_settings()
     sources = [s for s in list_sources(project_id) if s.get("enabled", True)]
-    results: list[ScrapeResult] = []
+    results: list[ScrapeResult | None] = [None] * len(sources)
     sb = get_supabase()
-    for source in sources:
+    pending: list[tuple[int, dict]] = []
+    for idx, source in enumerate(sources):
         if not _should_scrape_source(source):
             source_id = source.get("id")
             if source_id:
                 sb.table("sources").update(
                     {"last_status": "skipped", "updated_at": _now_iso()}
                 ).eq("id", source_id).execute()
-            results.append(ScrapeResult(source_id=source_id or "", count=0, status="skipped"))
+            results[idx] = ScrapeResult(source_id=source_id or "", count=0, status="skipped")
             continue
-        results.append(scrape_source(source, max_items=max_items))
-    return results
+        pending.append((idx, source))
+    if pending:
+        workers = max(1, min(settings.scrape_concurrency, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as pool:
+            futures = [
+                (idx, submit(pool, scrape_source, source, max_items=max_items))
+                for idx, source in pending
+            ]
+            for idx, future in futures:
+                results[idx] = future.result()
+    return [r for r in results if r is not None]
 
 
 def scrape_source(source: dict, max_items: int = 10) -> ScrapeResult:
@@ -819,35 +1041,59 @@ def scrape_source(source: dict, max_items: int = 10) -> ScrapeResult:
     sb = get_supabase()
     status = "ok"
     count = 0
+    stored = {"etag": source.get("http_etag"), "last_modified": source.get("http_last_modified")}
+    validators = dict(stored)
     try:
         if source_type == "reddit":
             count = _scrape_reddit_source(sb, source_id, url, max_items=max_items, config=config)
         elif source_type in {"rss", "youtube"}:
-            count = _scrape_rss_source(sb, source_id, url, max_items=max_items, config=config)
+            count = _scrape_rss_source(
+                sb, source_id, url, max_items=max_items, config=config, validators=validators
+            )
         elif source_type in {"page", "website"}:
-            count = _scrape_page_source(sb, source_id, url, config=config)
+            count = _scrape_page_source(sb, source_id, url, config=config, validators=validators)
         else:
             status = f"unknown source_type: {source_type}"
     except Exception as exc:
         status = f"error: {exc.__class__.__name__}"
-    sb.table("sources").update(
-        {
-            "last_scraped_at": _now_iso(),
-            "last_status": status,
-            "updated_at": _now_iso(),
-        }
-    ).eq("id", source_id).execute()
+    if status == "ok" and validators.get("not_modified"):
+        status = "not_modified"
+    update = {
+        "last_scraped_at": _now_iso(),
+        "last_status": status,
+        "updated_at": _now_iso(),
+    }
+    # Only persist validators once the new items are stored, so a failed run re-downloads.
+    if status == "ok" and (
+        validators.get("etag") != stored["etag"]
+        or validators.get("last_modified") != stored["last_modified"]
+    ):
+        update["http_etag"] = validators.get("etag")
+        update["http_last_modified"] = validators.get("last_modified")
+    sb.table("sources").update(update).eq("id", source_id).execute()
     return ScrapeResult(source_id=source_id, count=count, status=status)
 
 
-def _scrape_rss_source(sb: Any, source_id: str, url: str, max_items: int, config: dict | None = None) -> int:
+def _scrape_rss_source(
+    sb: Any,
+    source_id: str,
+    url: str,
+    max_items: int,
+    config: dict | None = None,
+    validators: dict | None = None,
+) -> int:
     settings = get_settings()
     kwargs = _request_kwargs(settings, config, accept="application/rss+xml,application/xml,text/xml")
-    resp = requests.get(url, **kwargs)
+    kwargs["headers"].update(_conditional_headers(validators))
+    resp = _http_get(url, **kwargs)
+    if resp.status_code == 304 and validators is not None:
+        validators["not_modified"] = True
+        return 0
     if resp.status_code in {401, 403}:
         _mark_auth_required(sb, source_id, config, f"http_{resp.status_code}")
         return 0
     resp.raise_for_status()
+    _store_validators(validators, resp)
     feed = feedparser.parse(resp.text)
     rows: list[dict] = []
     for entry in feed.entries[:max_items]:
@@ -879,7 +1125,7 @@ def _scrape_reddit_source(sb: Any, source_id: str, url: str, max_items: int, con
     settings = get_settings()
     listing_url = _normalize_reddit_listing_url(url, max_items=max_items)
     kwargs = _request_kwargs(settings, config, accept="application/json")
-    resp = requests.get(listing_url, **kwargs)
+    resp = _http_get(listing_url, **kwargs)
     resp.raise_for_status()
     payload = resp.json()
     children = payload.get("data", {}).get("children", []) or []
@@ -941,10 +1187,20 @@ def _scrape_reddit_source(sb: Any, source_id: str, url: str, max_items: int, con
     return _upsert_items(sb, rows)
 
 
-def _scrape_page_source(sb: Any, source_id: str, url: str, config: dict | None = None) -> int:
+def _scrape_page_source(
+    sb: Any,
+    source_id: str,
+    url: str,
+    config: dict | None = None,
+    validators: dict | None = None,
+) -> int:
     settings = get_settings()
     kwargs = _request_kwargs(settings, config, accept="text/html")
-    resp = requests.get(url, **kwargs)
+    kwargs["headers"].update(_conditional_headers(validators))
+    resp = _http_get(url, **kwargs)
+    if resp.status_code == 304 and validators is not None:
+        validators["not_modified"] = True
+        return 0
     if resp.status_code in {401, 403}:
         _mark_auth_required(sb, source_id, config, f"http_{resp.status_code}")
         return 0
@@ -953,6 +1209,12 @@ def _scrape_page_source(sb: Any, source_id: str, url: str, config: dict | None =
     reason = _detect_login_required(resp.text, extracted, resp.status_code, url=url)
     if reason:
         _mark_auth_required(sb, source_id, config, reason)
+        # A login wall must be fetched in full next run, not answered with a 304 that reads as ok.
+        if validators is not None:
+            validators["etag"] = None
+            validators["last_modified"] = None
+    else:
+        _store_validators(validators, resp)
     row = {
         "source_id": source_id,
         "title": url,
@@ -995,74 +1257,156 @@ def _source_website(url: str) -> str:
     return urlparse(url).netloc or "unknown"
 
 
-def ingest_source_items(limit: int = 20, fetch_full: bool = True, project_id: str | None = None) -> int:
+def ingest_source_items(
+    limit: int = 20,
+    fetch_full: bool = True,
+    project_id: str | None = None,
+    stats: dict | None = None,
+) -> int:
     settings = get_settings()
     sb = get_supabase()
-    source_filter: list[str] | None = None
-    if project_id:
-        sources = (
-            sb.table("sources")
-            .select("id")
-            .eq("project_id", project_id)
-            .execute()
-            .data
-            or []
-        )
-        source_filter = [s["id"] for s in sources if s.get("id")]
-        if not source_filter:
-            return 0
-    query = (
-        sb.table("source_items")
-        .select("id, source_id, title, url, content, raw, published_at, scraped_at")
-        .order("scraped_at", desc=True)
-        .limit(limit)
+    query = sb.table("sources").select(
+        "id, name, config, project_id, ingest_cursor_created_at, ingest_cursor_id"
     )
-    if source_filter:
-        query = query.in_("source_id", source_filter)
-    items = query.execute().data or []
-    if not items:
-        return 0
+    if project_id:
+        query = query.eq("project_id", project_id)
+    sources = query.execute().data or []
+    count = 0
+    for source in sources:
+        if source.get("id"):
+            count += _ingest_source_backlog(
+                sb, settings, source, batch_size=limit, fetch_full=fetch_full, stats=stats
+            )
+    stage_done("ingest", count)
+    return count
 
-    source_ids = [i["source_id"] for i in items if i.get("source_id")]
-    source_map: dict[str, dict] = {}
-    if source_ids:
-        sources = (
-            sb.table("sources")
-            .select("id, name, config, project_id")
-            .in_("id", list({sid for sid in source_ids}))
-            .execute()
-            .data
-            or []
-        )
-        source_map = {s["id"]: s for s in sources}
 
+def _ingest_source_backlog(
+    sb: Any, settings: Any, source: dict, batch_size: int, fetch_full: bool, stats: dict | None = None
+) -> int:
+    # Keyset over (created_at, id) from the source's persisted cursor, batch by batch,
+    # until every unseen source_item has been consumed. created_at never changes, unlike
+    # scraped_at which every re-scrape upsert rewrites.
+    source_id = source["id"]
+    cursor_at = source.get("ingest_cursor_created_at")
+    cursor_id = source.get("ingest_cursor_id")
+    batch_size = max(1, batch_size)
     count = 0
+    while True:
+        query = (
+            sb.table("source_items")
+            .select("id, source_id, title, url, content, raw, published_at, scraped_at, created_at")
+            .eq("source_id", source_id)
+            .order("created_at", desc=False)
+            .order("id", desc=False)
+            .limit(batch_size)
+        )
+        if cursor_at and cursor_id:
+            query = query.or_(
+                f'created_at.gt."{cursor_at}",and(created_at.eq."{cursor_at}",id.gt.{cursor_id})'
+            )
+        elif cursor_at:
+            query = query.gt("created_at", cursor_at)
+        items = query.execute().data or []
+        if not items:
+            break
+        failed: set[str] = set()
+        count += _ingest_items(sb, settings, items, {source_id: source}, fetch_full, stats, failed)
+        # Only move past items whose articles were stored (or already existed); the first
+        # failed insert and everything after it is read again next run.
+        consumed = items
+        if failed:
+            consumed = list(
+                takewhile(lambda item: _normalize_article_url(item.get("url") or "") not in failed, items)
+            )
+        if consumed:
+            cursor_at = consumed[-1].get("created_at")
+            cursor_id = consumed[-1].get("id")
+            sb.table("sources").update(
+                {"ingest_cursor_created_at": cursor_at, "ingest_cursor_id": cursor_id}
+            ).eq("id", source_id).execute()
+        if failed or len(items) < batch_size:
+            break
+    return count
+
+
+def _ingest_items(
+    sb: Any,
+    settings: Any,
+    items: list[dict],
+    source_map: dict[str, dict],
+    fetch_full: bool,
+    stats: dict | None = None,
+    failed: set[str] | None = None,
+) -> int:
+    candidates: list[tuple[str, dict]] = []
+    seen: set[str] = set()
     for item in items:
         url = _normalize_article_url(item.get("url") or "")
-        if not url:
-            continue
-        existing = sb.table("articles").select("id").eq("source_url", url).limit(1).execute()
-        if existing.data:
+        if not url or url in seen:
             continue
+        seen.add(url)
+        candidates.append((url, item))
+    existing = _existing_article_urls(sb, [url for url, _ in candidates])
+    pending = [(url, item) for url, item in candidates if url not in existing]
+    if not pending:
+        return 0
+
+    # Stage 1 downloads on threads, stage 2 runs trafilatura in the process pool.
+    # The whole batch shares one deadline from submission, sized for the queue depth,
+    # so items waiting behind slow ones are not timed out before they start.
+    futures: dict[str, Any] = {}
+    fetch_pool: ThreadPoolExecutor | None = None
+    if fetch_full:
+        workers = max(1, min(settings.ingest_fetch_workers, len(pending)))
+        fetch_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest-fetch")
+        deadline = time.monotonic() + settings.ingest_item_timeout * math.ceil(len(pending) / workers)
+        for url, item in pending:
+            config = (source_map.get(item.get("source_id")) or {}).get("config") or {}
+            futures[url] = submit(fetch_pool, _fetch_article, url, settings, config, True)
+
+    try:
+        if futures:
+            wait(list(futures.values()), timeout=max(0.0, deadline - time.monotonic()))
+        rows = _build_article_rows(sb, settings, pending, source_map, futures)
+    finally:
+        if fetch_pool is not None:
+            fetch_pool.shutdown(wait=False, cancel_futures=True)
+    # Duplicates are inserted already marked so extraction and judging never see them.
+    duplicates = _mark_exact_duplicates(sb, rows) + annotate_rows(sb, rows)
+    inserted = _insert_articles_bulk(sb, rows, failed)
+    if stats is not None:
+        stats["duplicates"] = stats.get("duplicates", 0) + duplicates
+    return inserted
+
+
+# Bulk upserts send the union of keys in a batch and NULL the missing ones, so every
+# article row carries these and only flagged duplicates override them.
+_NOT_DUPLICATE = {"duplicate_of": None, "unusable": False, "unusable_reason": None, "unusable_at": None}
+
+
+def _build_article_rows(
+    sb: Any,
+    settings: Any,
+    pending: list[tuple[str, dict]],
+    source_map: dict[str, dict],
+    futures: dict[str, Any],
+) -> list[dict]:
+    rows: list[dict] = []
+    for url, item in pending:
         source = source_map.get(item.get("source_id")) or {}
         config = source.get("config") or {}
         raw_text = (item.get("content") or "").strip()
-        if fetch_full:
+        future = futures.get(url)
+        if future is not None and future.done():
             try:
-                kwargs = _request_kwargs(settings, config, accept="text/html")
-                resp = requests.get(url, **kwargs)
-                if resp.status_code in {401, 403}:
-                    _mark_auth_required(sb, item.get("source_id"), config, f"http_{resp.status_code}")
-                elif resp.status_code == 200:
-                    extracted = trafilatura.extract(
-                        resp.text, include_comments=False, include_tables=False
-                    )
-                    reason = _detect_login_required(resp.text, extracted, resp.status_code, url=url)
-                    if reason:
-                        _mark_auth_required(sb, item.get("source_id"), config, reason)
-                    if extracted:
-                        raw_text = extracted.strip()
+                fetched = future.result()
+                if fetched.get("reason"):
+                    _mark_auth_required(sb, item.get("source_id"), config, fetched["reason"])
+                if fetched.get("status_code") == 200 and fetched.get("extracted"):
+                    raw_text = fetched["extracted"]
             except Exception:
+                # Failed: fall back to the stored feed excerpt, as for items past the deadline.
                 pass
         if not raw_text:
             raw_text = (item.get("raw") or "").strip()
@@ -1070,6 +1414,8 @@ def ingest_source_items(limit: int = 20, fetch_full: bool = True, project_id: st
             continue
         raw_text = _truncate(raw_text, settings.extraction_max_chars)
         row = {
+            # Client-side id so near-duplicates within one batch can point at each other.
+            "id": str(uuid.uuid4()),
             "source_url": url,
             "source_website": _source_website(url),
             "project_id": source.get("project_id"),
@@ -1081,9 +1427,94 @@ def ingest_source_items(limit: int = 20, fetch_full: bool = True, project_id: st
             "scraped_at": item.get("scraped_at") or _now_iso(),
             "processed": False,
             "scored": False,
+            **_NOT_DUPLICATE,
+            "simhash": None,
+            "simhash_bands": None,
         }
-        sb.table("articles").insert(row).execute()
-        count += 1
+        rows.append(row)
+    return rows
+
+
+def _mark_exact_duplicates(sb: Any, rows: list[dict]) -> int:
+    by_project: dict[str | None, list[dict]] = {}
+    for row in rows:
+        for key, value in _NOT_DUPLICATE.items():
+            row.setdefault(key, value)
+        if row.get("content_hash"):
+            by_project.setdefault(row.get("project_id"), []).append(row)
+    count = 0
+    for project_id, project_rows in by_project.items():
+        canonical: dict[str, str] = {}
+        hashes = list({row["content_hash"] for row in project_rows})
+        for chunk in _chunked(hashes, size=50):
+            query = (
+                sb.table("articles")
+                .select("id, content_hash")
+                .in_("content_hash", chunk)
+                .is_("duplicate_of", "null")
+                .eq("unusable", False)
+                .order("created_at", desc=False)
+            )
+            if project_id:
+                query = query.eq("project_id", project_id)
+            else:
+                query = query.is_("project_id", "null")
+            try:
+                resp = query.execute()
+            except Exception:
+                continue
+            for existing in resp.data or []:
+                canonical.setdefault(existing["content_hash"], existing["id"])
+        for row in project_rows:
+            keep = canonical.get(row["content_hash"])
+            if keep is None:
+                canonical[row["content_hash"]] = row["id"]
+                continue
+            row.update(
+                {
+                    "duplicate_of": keep,
+                    "unusable": True,
+                    "unusable_reason": "duplicate",
+                    "unusable_at": _now_iso(),
+                }
+            )
+            count += 1
+    return count
+
+
+def _existing_article_urls(sb: Any, urls: list[str]) -> set[str]:
+    existing: set[str] = set()
+    # Article URLs are long; keep each in_() filter well under PostgREST/proxy URL limits.
+    for chunk in _chunked(urls, size=50):
+        resp = sb.table("articles").select("source_url").in_("source_url", chunk).execute()
+        existing.update(row["source_url"] for row in resp.data or [] if row.get("source_url"))
+    return existing
+
+
+def _insert_articles_bulk(sb: Any, rows: list[dict], failed: set[str] | None = None) -> int:
+    # failed collects source_urls that could not be written, so callers can retry them.
+    count = 0
+    for chunk in _chunked(rows, size=100):
+        try:
+            resp = (
+                sb.table("articles")
+                .upsert(chunk, on_conflict="source_url", ignore_duplicates=True, default_to_null=False)
+                .execute()
+            )
+            count += len(resp.data or [])
+        except Exception:
+            # One bad row should not drop the whole batch.
+            for row in chunk:
+                try:
+                    resp = (
+                        sb.table("articles")
+                        .upsert(row, on_conflict="source_url", ignore_duplicates=True)
+                        .execute()
+                    )
+                    count += len(resp.data or [])
+                except Exception:
+                    if failed is not None:
+                        failed.add(row["source_url"])
     return count
 
 
@@ -1102,7 +1533,7 @@ def check_source_access(source_id: str, sample: int = 3) -> dict:
     try:
         if source_type in {"rss", "youtube"}:
             kwargs = _request_kwargs(settings, config, accept="application/rss+xml,application/xml,text/xml")
-            resp = requests.get(url, **kwargs)
+            resp = _http_get(url, **kwargs)
             if resp.status_code in {401, 403}:
                 reason = f"http_{resp.status_code}"
             else:
@@ -1115,7 +1546,7 @@ def check_source_access(source_id: str, sample: int = 3) -> dict:
         elif source_type == "reddit":
             listing_url = _normalize_reddit_listing_url(url, max_items=sample)
             kwargs = _request_kwargs(settings, config, accept="application/json")
-            resp = requests.get(listing_url, **kwargs)
+            resp = _http_get(listing_url, **kwargs)
             if resp.status_code in {401, 403}:
                 reason = f"http_{resp.status_code}"
             else:
@@ -1146,13 +1577,8 @@ def check_source_access(source_id: str, sample: int = 3) -> dict:
         if not target or _looks_like_media(target):
             continue
         try:
-            kwargs = _request_kwargs(settings, config, accept="text/html")
-            resp = requests.get(target, **kwargs)
-            if resp.status_code in {401, 403}:
-                reason = f"http_{resp.status_code}"
-                break
-            extracted = trafilatura.extract(resp.text, include_comments=False, include_tables=False) or ""
-            reason = _detect_login_required(resp.text, extracted, resp.status_code, url=target)
+            fetched = _fetch_article(target, settings, config=config)
+            reason = fetched.get("reason")
             if reason:
                 break
         except Exception:
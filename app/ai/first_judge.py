@@ -21,6 +21,48 @@ def judge_summary(summary: str) -> dict:
     )
 
 
+BATCH_SYSTEM_PROMPT = (
+    "You are a content judge. Score each numbered summary 1-10 for viral potential, "
+    "judging every summary independently. "
+    'Return JSON with key: scores (object mapping each summary number to an int score), '
+    'e.g. {"scores": {"1": 7, "2": 4}}.'
+)
+
+
+def judge_summaries(summaries: dict[str, str]) -> dict[str, int]:
+    # Scores several summaries in one request. Items are sent under short numeric keys;
+    # only ids that come back with a valid 1-10 score are returned.
+    if not summaries:
+        return {}
+    settings = get_settings()
+    client = OpenAIClient()
+    keys = {str(i): item_id for i, item_id in enumerate(summaries, start=1)}
+    blocks = [f"[{key}]\n{summaries[item_id]}" for key, item_id in keys.items()]
+    user = "Summaries:\n\n" + "\n\n".join(blocks) + "\n\nReturn JSON."
+    result = client.chat_json(
+        model=settings.judge_model,
+        system=BATCH_SYSTEM_PROMPT,
+        user=user,
+        temperature=0.2,
+        max_tokens=100 + 20 * len(keys),
+    )
+    raw_scores = result.get("scores") if isinstance(result, dict) else None
+    if not isinstance(raw_scores, dict):
+        return {}
+    scores: dict[str, int] = {}
+    for key, value in raw_scores.items():
+        item_id = keys.get(str(key).strip("[] "))
+        if item_id is None or isinstance(value, bool):
+            continue
+        try:
+            score = int(value)
+        except (TypeError, ValueError):
+            continue
+        if 1 <= score <= 10:
+            scores[item_id] = score
+    return scores
+
+
 def default_format_rules(score: int) -> list[str]:
     if score >= 6:
         return ["video"]
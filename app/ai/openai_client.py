@@ -5,6 +5,8 @@ from typing import Any
 import requests
 
 from app.config import get_settings
+from app.http_client import get_session
+from app.stage_metrics import record_llm_call, record_tokens
 
 
 class OpenAIClient:
@@ -40,12 +42,14 @@ class OpenAIClient:
         last_err: Exception | None = None
         for attempt in range(retries + 1):
             try:
-                return requests.post(
+                resp = get_session().post(
                     f"{self._base_url}{path}",
                     headers=self._headers(),
                     json=payload,
                     timeout=self._timeout,
                 )
+                record_llm_call()
+                return resp
             except (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError) as exc:
                 last_err = exc
                 if attempt >= retries:
@@ -80,6 +84,7 @@ class OpenAIClient:
         if not resp.ok:
             raise RuntimeError(f"OpenAI error {resp.status_code}: {resp.text}")
         data = resp.json()
+        record_tokens(data.get("usage"))
         content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
         if not str(content).strip():
             raise RuntimeError(f"OpenAI returned empty content: {data}")
@@ -111,6 +116,7 @@ class OpenAIClient:
         if not resp.ok:
             raise RuntimeError(f"OpenAI error {resp.status_code}: {resp.text}")
         data = resp.json()
+        record_tokens(data.get("usage"))
         content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
         if not str(content).strip():
             raise RuntimeError(f"OpenAI returned empty content: {data}")
@@ -149,6 +155,7 @@ class OpenAIClient:
         if not resp.ok:
             raise RuntimeError(f"OpenAI error {resp.status_code}: {resp.text}")
         data = resp.json()
+        record_tokens(data.get("usage"))
         content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
         if not str(content).strip():
             raise RuntimeError(f"OpenAI returned empty content: {data}")
@@ -168,7 +175,7 @@ class OpenAIClient:
         timestamp_granularities: list[str] | None = None,
     ):
         with open(audio_path, "rb") as f:
-            resp = requests.post(
+            resp = get_session().post(
                 f"{self._base_url}/audio/transcriptions",
                 headers={"Authorization": f"Bearer {self._api_key}"},
                 files={"file": f},
@@ -179,6 +186,7 @@ class OpenAIClient:
                 },
                 timeout=self._timeout,
             )
+        record_llm_call()
         resp.raise_for_status()
         if response_format == "text":
             return resp.text
@@ -1,10 +1,9 @@
 from pathlib import Path
 import base64
 
-import requests
-
 from app.ai.openai_client import OpenAIClient
 from app.config import get_settings
+from app.http_client import get_session
 
 
 def _inworld_tts(text: str, voice: str) -> bytes:
@@ -18,7 +17,7 @@ def _inworld_tts(text: str, voice: str) -> bytes:
         "voiceId": voice,
         "modelId": settings.inworld_tts_model,
     }
-    resp = requests.post(
+    resp = get_session().post(
         url,
         headers={
             "Authorization": f"Basic {settings.inworld_api_key}",
@@ -14,19 +14,42 @@ load_dotenv(_ROOT / ".env", override=False)
 class Settings(BaseModel):
     supabase_url: str
     supabase_key: str
+    database_url: str | None = None
     openai_api_key: str | None = None
     openai_base_url: str = "https://api.openai.com/v1"
     manual_intake_script: str = "scripts/extract_text.py"
     manual_intake_dir: str | None = None
     max_words: int = 2500
     request_timeout: int = 30
+    scrape_concurrency: int = 8
+    pipeline_workers: int = 1
+    project_cache_ttl_seconds: int = 300
+    scrape_per_host_concurrency: int = 2
+    http_pool_connections: int = 32
+    http_pool_maxsize: int = 10
+    http_retries: int = 2
+    rate_limit_per_domain: float = 1.0
+    rate_limit_burst: float = 3.0
+    rate_limit_min_per_domain: float = 0.05
+    rate_limit_max_per_domain: float = 4.0
+    ingest_fetch_workers: int = 8
+    ingest_extract_workers: int = 2
+    ingest_item_timeout: int = 45
+    http_cache_path: str = "cache/http_cache.sqlite3"
+    http_cache_ttl_seconds: int = 21600
+    http_cache_max_mb: int = 256
     extraction_max_chars: int = 20000
     extraction_use_llm: bool = True
     extraction_model: str = "gpt-5-nano"
+    extraction_concurrency: int = 4
+    lease_seconds: int = 900
     judge_model: str = "gpt-4.1-mini"
+    judge_batch_size: int = 1
     second_judge_model: str = "gpt-4.1-mini"
+    second_judge_concurrency: int = 4
     generation_models: list[str] = ["gpt-4.1-mini"]
     generation_variants: int = 3
+    generation_model_concurrency: int = 3
     video_min_score: int = 6
     audio_roundup_model: str = "gpt-5-mini"
     audio_roundup_size: int = 8
@@ -80,24 +103,47 @@ def get_settings() -> Settings:
     return Settings(
         supabase_url=supabase_url,
         supabase_key=supabase_key,
+        database_url=os.environ.get("DATABASE_URL") or None,
         openai_api_key=os.environ.get("OPENAI_API_KEY"),
         openai_base_url=os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1"),
         manual_intake_script=os.environ.get("MANUAL_INTAKE_SCRIPT", "scripts/extract_text.py"),
         manual_intake_dir=os.environ.get("MANUAL_INTAKE_DIR"),
         max_words=int(os.environ.get("MAX_WORDS", "2500")),
         request_timeout=int(os.environ.get("REQUEST_TIMEOUT", "30")),
+        scrape_concurrency=int(os.environ.get("SCRAPE_CONCURRENCY", "8")),
+        pipeline_workers=int(os.environ.get("PIPELINE_WORKERS", "1")),
+        project_cache_ttl_seconds=int(os.environ.get("PROJECT_CACHE_TTL_SECONDS", "300")),
+        scrape_per_host_concurrency=int(os.environ.get("SCRAPE_PER_HOST_CONCURRENCY", "2")),
+        http_pool_connections=int(os.environ.get("HTTP_POOL_CONNECTIONS", "32")),
+        http_pool_maxsize=int(os.environ.get("HTTP_POOL_MAXSIZE", "10")),
+        http_retries=int(os.environ.get("HTTP_RETRIES", "2")),
+        rate_limit_per_domain=float(os.environ.get("RATE_LIMIT_PER_DOMAIN", "1.0")),
+        rate_limit_burst=float(os.environ.get("RATE_LIMIT_BURST", "3")),
+        rate_limit_min_per_domain=float(os.environ.get("RATE_LIMIT_MIN_PER_DOMAIN", "0.05")),
+        rate_limit_max_per_domain=float(os.environ.get("RATE_LIMIT_MAX_PER_DOMAIN", "4.0")),
+        ingest_fetch_workers=int(os.environ.get("INGEST_FETCH_WORKERS", "8")),
+        ingest_extract_workers=int(os.environ.get("INGEST_EXTRACT_WORKERS", "2")),
+        ingest_item_timeout=int(os.environ.get("INGEST_ITEM_TIMEOUT", "45")),
+        http_cache_path=os.environ.get("HTTP_CACHE_PATH", "cache/http_cache.sqlite3"),
+        http_cache_ttl_seconds=int(os.environ.get("HTTP_CACHE_TTL_SECONDS", "21600")),
+        http_cache_max_mb=int(os.environ.get("HTTP_CACHE_MAX_MB", "256")),
         extraction_max_chars=int(os.environ.get("EXTRACTION_MAX_CHARS", "20000")),
         extraction_use_llm=os.environ.get("EXTRACTION_USE_LLM", "true").lower()
         in ("1", "true", "yes"),
         extraction_model=os.environ.get("EXTRACTION_MODEL", "gpt-5-nano"),
+        extraction_concurrency=int(os.environ.get("EXTRACTION_CONCURRENCY", "4")),
+        lease_seconds=int(os.environ.get("LEASE_SECONDS", "900")),
         judge_model=os.environ.get("JUDGE_MODEL", "gpt-4.1-mini"),
+        judge_batch_size=int(os.environ.get("JUDGE_BATCH_SIZE", "1")),
         second_judge_model=os.environ.get("SECOND_JUDGE_MODEL", "gpt-4.1-mini"),
+        second_judge_concurrency=int(os.environ.get("SECOND_JUDGE_CONCURRENCY", "4")),
         generation_models=[
             m.strip()
             for m in os.environ.get("GENERATION_MODELS", "gpt-4.1-mini").split(",")
             if m.strip()
         ],
         generation_variants=int(os.environ.get("GENERATION_VARIANTS", "3")),
+        generation_model_concurrency=int(os.environ.get("GENERATION_MODEL_CONCURRENCY", "3")),
         video_min_score=int(os.environ.get("VIDEO_MIN_SCORE", "6")),
         audio_roundup_model=os.environ.get("AUDIO_ROUNDUP_MODEL", "gpt-5-mini"),
         audio_roundup_size=int(os.environ.get("AUDIO_ROUNDUP_SIZE", "5")),
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .config import get_settings
+
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
+
+
+def cache_key(*parts: str) -> str:
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _connection() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        path = Path(get_settings().http_cache_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries(accessed_at)")
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def cache_get(key: str) -> Any | None:
+    settings = get_settings()
+    if settings.http_cache_ttl_seconds <= 0:
+        return None
+    now = time.time()
+    try:
+        with _lock:
+            conn = _connection()
+            row = conn.execute("SELECT value, stored_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return None
+            value, stored_at = row
+            if now - stored_at > settings.http_cache_ttl_seconds:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+        return json.loads(value)
+    except Exception:
+        # The cache is an optimisation; a broken cache file must never fail a fetch.
+        return None
+
+
+def cache_put(key: str, value: Any) -> None:
+    settings = get_settings()
+    if settings.http_cache_ttl_seconds <= 0:
+        return
+    payload = json.dumps(value)
+    now = time.time()
+    try:
+        with _lock:
+            conn = _connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            _evict(conn, settings.http_cache_ttl_seconds, settings.http_cache_max_mb * 1024 * 1024)
+            conn.commit()
+    except Exception:
+        return
+
+
+def _evict(conn: sqlite3.Connection, ttl_seconds: int, max_bytes: int) -> None:
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total <= max_bytes:
+        return
+    conn.execute("DELETE FROM entries WHERE stored_at < ?", (time.time() - ttl_seconds,))
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    # Trim least recently used entries to 90% of the cap so we do not evict on every put.
+    target = int(max_bytes * 0.9)
+    doomed: list[str] = []
+    for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC"):
+        if total <= target:
+            break
+        doomed.append(key)
+        total -= size
+    conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in doomed])
+
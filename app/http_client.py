@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import threading
+import time
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from .config import get_settings
+from .stage_metrics import record_http
+
+_stats: dict[str, dict] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(host: str, reused: bool, elapsed_ms: float, error: bool = False) -> None:
+    with _stats_lock:
+        row = _stats.setdefault(
+            host,
+            {"requests": 0, "reused": 0, "new_connections": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0},
+        )
+        row["requests"] += 1
+        if error:
+            row["errors"] += 1
+        elif reused:
+            row["reused"] += 1
+        else:
+            row["new_connections"] += 1
+        row["total_ms"] += elapsed_ms
+        row["max_ms"] = max(row["max_ms"], elapsed_ms)
+
+
+_connects = threading.local()
+
+
+def _count_connect() -> None:
+    _connects.count = getattr(_connects, "count", 0) + 1
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        _count_connect()
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        _count_connect()
+        super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _CountingAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        host = (urlparse(request.url or "").netloc or "unknown").lower()
+        before = getattr(_connects, "count", 0)
+        started = time.perf_counter()
+        try:
+            resp = super().send(request, *args, **kwargs)
+        except Exception:
+            _record(host, False, (time.perf_counter() - started) * 1000, error=True)
+            record_http(error=True)
+            raise
+        # connect() only runs when urllib3 has to open a socket; otherwise keep-alive was reused.
+        reused = getattr(_connects, "count", 0) == before
+        _record(host, reused, (time.perf_counter() - started) * 1000)
+        record_http(error=resp.status_code >= 400)
+        return resp
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    settings = get_settings()
+    retry = Retry(
+        total=settings.http_retries,
+        connect=settings.http_retries,
+        read=0,
+        status=settings.http_retries,
+        backoff_factor=0.5,
+        # 429/503 go straight back to the caller so the per-domain limiter sees the
+        # throttle and its Retry-After; sleeping here would hold the per-host slot.
+        status_forcelist=(500, 502, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = _CountingAdapter(
+        pool_connections=settings.http_pool_connections,
+        pool_maxsize=settings.http_pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Sites share one session; never replay a publisher's cookies to another request.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def http_stats() -> list[dict]:
+    with _stats_lock:
+        rows = [{"host": host, **values} for host, values in _stats.items()]
+    for row in rows:
+        count = row["requests"] or 1
+        row["avg_ms"] = round(row["total_ms"] / count, 1)
+        row["total_ms"] = round(row["total_ms"], 1)
+        row["max_ms"] = round(row["max_ms"], 1)
+        row["reuse_rate"] = round((row["reused"] / count) * 100, 1)
+    rows.sort(key=lambda r: r["requests"], reverse=True)
+    return rows
+
+
+def reset_http_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
@@ -31,6 +31,7 @@ from .admin import (
 )
 from .config import get_settings
 from .db import get_supabase
+from .http_client import http_stats
 from .ingest import (
     build_rows,
     insert_articles,
@@ -51,6 +52,7 @@ from .pipeline import (
     run_project_pipeline,
     update_post_media,
 )
+from .rate_limit import limiter_state
 
 
 app = FastAPI(title="Gossip Intake API", version="0.1.0")
@@ -292,6 +294,16 @@ def api_check_project_access(project_id: str, sample: int = Query(3, ge=1, le=10
     return check_project_access(project_id, sample=sample)
 
 
+@app.get("/api/http/stats")
+def api_http_stats() -> list[dict]:
+    return http_stats()
+
+
+@app.get("/api/http/limits")
+def api_http_limits() -> list[dict]:
+    return limiter_state()
+
+
 @app.get("/api/projects/{project_id}/youtube")
 def api_get_youtube_account(project_id: str) -> dict | None:
     return get_youtube_account(project_id)
@@ -3,18 +3,18 @@ import shutil
 import subprocess
 from pathlib import Path
 
-import requests
 from PIL import Image, ImageDraw, ImageOps
 
 from app.ai.image import generate_image
 from app.config import get_settings
+from app.http_client import get_session
 from app.media.audio import render_audio_roundup
 from app.media.video import assemble_video
 from app.media.paths import podcast_image_path
 
 
 def _download_image(url: str, path: Path) -> None:
-    resp = requests.get(url, timeout=30)
+    resp = get_session().get(url, timeout=30)
     resp.raise_for_status()
     path.write_bytes(resp.content)
 
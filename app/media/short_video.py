@@ -5,13 +5,13 @@ import subprocess
 from pathlib import Path
 from typing import Iterable
 
-import requests
 from PIL import Image
 
 from app.ai.asr import transcribe_audio
 from app.ai.image import generate_image
 from app.ai.tts import generate_voiceover
 from app.config import get_settings
+from app.http_client import get_session
 from app.media.video import assemble_video, create_placeholder_images
 
 
@@ -34,7 +34,7 @@ def _chunks(text: str, max_chars: int | None = None) -> Iterable[str]:
 
 
 def _download_image(url: str, path: Path) -> None:
-    resp = requests.get(url, timeout=30)
+    resp = get_session().get(url, timeout=30)
     resp.raise_for_status()
     path.write_bytes(resp.content)
 
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+# 64-bit SimHash over word 3-shingles. The hash is split into 4 bands of 16 bits;
+# two hashes within MAX_DISTANCE (< BANDS) bits must share at least one band exactly,
+# so candidates come from a GIN-indexed band overlap instead of pairwise comparison.
+SIMHASH_BITS = 64
+BAND_BITS = 16
+BANDS = SIMHASH_BITS // BAND_BITS
+MAX_DISTANCE = 3
+MIN_TOKENS = 30
+CANDIDATE_LIMIT = 50
+CANDIDATE_WINDOW_DAYS = 14
+LOOKUP_CHUNK = 25
+
+_MASK = (1 << SIMHASH_BITS) - 1
+_token_re = re.compile(r"\w+", re.UNICODE)
+
+
+def simhash(text: str | None) -> int | None:
+    tokens = _token_re.findall((text or "").lower())
+    if len(tokens) < MIN_TOKENS:
+        return None
+    weights = [0] * SIMHASH_BITS
+    for i in range(len(tokens) - 2):
+        shingle = " ".join(tokens[i : i + 3]).encode("utf-8")
+        value = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    result = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            result |= 1 << bit
+    # Stored in a signed BIGINT column.
+    return result - (1 << SIMHASH_BITS) if result >= 1 << (SIMHASH_BITS - 1) else result
+
+
+def simhash_bands(value: int) -> list[int]:
+    unsigned = value & _MASK
+    mask = (1 << BAND_BITS) - 1
+    return [(band << BAND_BITS) | (unsigned >> (band * BAND_BITS) & mask) for band in range(BANDS)]
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK).count("1")
+
+
+def _candidates(
+    sb: Any, project_id: str | None, bands: list[int], limit: int, exclude_id: str | None = None
+) -> list[dict]:
+    # Newest usable canonicals first: an expired or unusable article must not swallow a fresh copy.
+    since = datetime.now(timezone.utc) - timedelta(days=CANDIDATE_WINDOW_DAYS)
+    query = (
+        sb.table("articles")
+        .select("id, simhash")
+        .overlaps("simhash_bands", bands)
+        .is_("duplicate_of", "null")
+        .eq("unusable", False)
+        .gte("created_at", since.isoformat())
+        .order("created_at", desc=True)
+        .limit(limit)
+    )
+    if project_id:
+        query = query.eq("project_id", project_id)
+    else:
+        query = query.is_("project_id", "null")
+    if exclude_id:
+        query = query.neq("id", exclude_id)
+    return query.execute().data or []
+
+
+def _closest(value: int, candidates: list[dict]) -> str | None:
+    best: tuple[int, str] | None = None
+    for row in candidates:
+        other = row.get("simhash")
+        if other is None:
+            continue
+        distance = hamming(value, int(other))
+        if distance <= MAX_DISTANCE and (best is None or distance < best[0]):
+            best = (distance, row["id"])
+    return best[1] if best else None
+
+
+def find_near_duplicate(
+    sb: Any, project_id: str | None, value: int, exclude_id: str | None = None
+) -> str | None:
+    return _closest(value, _candidates(sb, project_id, simhash_bands(value), CANDIDATE_LIMIT, exclude_id))
+
+
+def _batch_candidates(sb: Any, rows: list[dict]) -> dict[str | None, list[dict]]:
+    # One band lookup per project per LOOKUP_CHUNK rows instead of one query per row.
+    by_project: dict[str | None, list[dict]] = {}
+    for row in rows:
+        by_project.setdefault(row.get("project_id"), []).append(row)
+    found: dict[str | None, list[dict]] = {}
+    for project_id, project_rows in by_project.items():
+        seen: dict[str, dict] = {}
+        for i in range(0, len(project_rows), LOOKUP_CHUNK):
+            chunk = project_rows[i : i + LOOKUP_CHUNK]
+            bands = sorted({band for row in chunk for band in row["simhash_bands"]})
+            try:
+                candidates = _candidates(sb, project_id, bands, CANDIDATE_LIMIT * len(chunk))
+            except Exception:
+                continue
+            for candidate in candidates:
+                seen.setdefault(candidate["id"], candidate)
+        found[project_id] = list(seen.values())
+    return found
+
+
+def _duplicate_fields(canonical_id: str) -> dict:
+    return {
+        "duplicate_of": canonical_id,
+        "unusable": True,
+        "unusable_reason": "near_duplicate",
+        "unusable_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def annotate_rows(sb: Any, rows: list[dict]) -> int:
+    # Adds simhash fields to rows about to be inserted and flags near-duplicates of
+    # indexed articles or of earlier rows in the same batch (rows need an "id").
+    pending = []
+    for row in rows:
+        value = simhash(row.get("content") or row.get("raw_html"))
+        if value is None:
+            continue
+        row["simhash"] = value
+        row["simhash_bands"] = simhash_bands(value)
+        if not row.get("duplicate_of"):
+            pending.append(row)
+    indexed = _batch_candidates(sb, pending)
+    count = 0
+    batch: dict[str | None, list[tuple[int, str]]] = {}
+    for row in pending:
+        value = row["simhash"]
+        project_id = row.get("project_id")
+        canonical_id = next(
+            (other_id for other, other_id in batch.get(project_id, []) if hamming(value, other) <= MAX_DISTANCE),
+            None,
+        )
+        if canonical_id is None:
+            canonical_id = _closest(value, indexed.get(project_id, []))
+        if canonical_id:
+            row.update(_duplicate_fields(canonical_id))
+            count += 1
+        else:
+            batch.setdefault(project_id, []).append((value, row["id"]))
+    return count
+
+
+def index_article(sb: Any, article: dict, text: str | None) -> str | None:
+    # For articles that skipped ingest (manual intake, legacy rows): store the hash and
+    # return the canonical id when the article is a near-duplicate.
+    value = simhash(text)
+    if value is None:
+        return None
+    canonical_id = find_near_duplicate(sb, article.get("project_id"), value, exclude_id=article["id"])
+    update = {"simhash": value, "simhash_bands": simhash_bands(value)}
+    if canonical_id:
+        update.update(_duplicate_fields(canonical_id))
+    sb.table("articles").update(update).eq("id", article["id"]).execute()
+    return canonical_id
@@ -1,15 +1,33 @@
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 import hashlib
+import os
 import re
+import socket
+import threading
+from typing import Any, Callable
+
+from postgrest.exceptions import APIError
 
 from app.ai.audio_roundup import generate_audio_roundup
 from app.ai.extract import extract_summary
-from app.ai.first_judge import default_format_rules, judge_summary
+from app.ai.first_judge import default_format_rules, judge_summaries, judge_summary
 from app.ai.generate import generate_video_variant, generation_models
 from app.ai.second_judge import pick_winner
 from app.admin import ingest_source_items, list_projects, scrape_project
 from app.config import get_settings
 from app.db import get_supabase
+from app.near_dupe import index_article
+from app.project_cache import get_project
+from app.stage_events import stage_done
+from app.stage_metrics import collect, stage, submit
+
+
+WRITE_BACK_BATCH = 25
+
+_model_slots: dict[str, threading.BoundedSemaphore] = {}
+_model_slots_lock = threading.Lock()
 
 
 def _now() -> str:
@@ -25,12 +43,63 @@ def _content_hash(text: str | None) -> str | None:
     return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
+def _lease_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _rpc_missing(exc: Exception) -> bool:
+    # PGRST202: PostgREST has no such function (HTTP 404); 42883: undefined function.
+    return isinstance(exc, APIError) and str(exc.code) in ("PGRST202", "42883", "404")
+
+
+def claim_articles(
+    stage: str, limit: int, project_id: str | None = None, min_score: int = 0
+) -> list[dict] | None:
+    # Atomically leases rows for this worker; None means the RPC is not installed.
+    # Any other failure is raised so callers never fall back to unleased reads.
+    sb = get_supabase()
+    try:
+        resp = sb.rpc(
+            "claim_articles",
+            {
+                "p_stage": stage,
+                "p_owner": _lease_owner(),
+                "p_limit": limit,
+                "p_project_id": project_id,
+                "p_min_score": min_score,
+                "p_lease_seconds": get_settings().lease_seconds,
+            },
+        ).execute()
+    except Exception as exc:
+        if _rpc_missing(exc):
+            return None
+        raise
+    return resp.data or []
+
+
+def release_articles(items: list[dict]) -> None:
+    ids = [item["id"] for item in items if item.get("lease_owner")]
+    if not ids:
+        return
+    sb = get_supabase()
+    try:
+        sb.table("articles").update({"lease_owner": None, "lease_expires_at": None}).in_("id", ids).execute()
+    except Exception:
+        # Leases expire on their own.
+        return
+
+
 def fetch_unprocessed(limit: int = 20, project_id: str | None = None) -> list[dict]:
+    claimed = claim_articles("extract", limit, project_id)
+    if claimed is not None:
+        return claimed
     sb = get_supabase()
     query = (
         sb.table("articles")
-        .select("id, raw_html, title, source_url, content_hash")
+        .select("id, project_id, raw_html, title, source_url, content_hash, simhash")
         .eq("processed", False)
+        .eq("unusable", False)
+        .is_("duplicate_of", "null")
         .limit(limit)
     )
     if project_id:
@@ -57,31 +126,94 @@ def mark_processed(
     sb.table("articles").update(update).eq("id", article_id).execute()
 
 
+def mark_processed_bulk(rows: list[dict]) -> None:
+    # rows: {id, summary, title, content, content_hash}; one RPC for the whole batch.
+    if not rows:
+        return
+    sb = get_supabase()
+    try:
+        sb.rpc("bulk_mark_processed", {"p_items": rows}).execute()
+        return
+    except Exception:
+        pass
+    for row in rows:
+        mark_processed(row["id"], row["summary"], row.get("title"), row.get("content"), row.get("content_hash"))
+
+
 def run_extraction(limit: int = 3, project_id: str | None = None) -> int:
     items = fetch_unprocessed(limit=limit, project_id=project_id)
-    count = 0
+    try:
+        count = _extract_items(items)
+    finally:
+        release_articles(items)
+    stage_done("extract", count)
+    return count
+
+
+def _extract_items(items: list[dict]) -> int:
+    settings = get_settings()
+    work: list[tuple[dict, str]] = []
     for item in items:
         raw = item.get("raw_html") or ""
         if not raw.strip():
             continue
-        result = extract_summary(raw)
-        summary = result.get("summary") or ""
-        title = result.get("title")
-        content = result.get("content")
-        content_hash = item.get("content_hash") or _content_hash(content or raw)
-        if summary:
-            mark_processed(item["id"], summary, title, content, content_hash)
-            count += 1
+        if item.get("simhash") is None:
+            try:
+                if index_article(get_supabase(), item, raw):
+                    continue
+            except Exception:
+                pass
+        work.append((item, raw))
+    if not work:
+        return 0
+    count = 0
+    done: list[dict] = []
+    workers = max(1, min(settings.extraction_concurrency, len(work)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract") as pool:
+        # Submitted in fetch order; completed results are written back in bulk as they accumulate.
+        futures = {submit(pool, extract_summary, raw): (item, raw) for item, raw in work}
+        try:
+            for future in as_completed(futures):
+                item, raw = futures[future]
+                try:
+                    result = future.result()
+                except Exception:
+                    # One failed extraction must not drop the rest; the article stays unprocessed
+                    # and is released for the next run.
+                    continue
+                summary = result.get("summary") or ""
+                content = result.get("content")
+                if summary:
+                    done.append(
+                        {
+                            "id": item["id"],
+                            "summary": summary,
+                            "title": result.get("title"),
+                            "content": content,
+                            "content_hash": item.get("content_hash") or _content_hash(content or raw),
+                        }
+                    )
+                    count += 1
+                if len(done) >= WRITE_BACK_BATCH:
+                    mark_processed_bulk(done)
+                    done = []
+        finally:
+            mark_processed_bulk(done)
     return count
 
 
 def fetch_unscored(limit: int = 20, project_id: str | None = None) -> list[dict]:
+    claimed = claim_articles("judge", limit, project_id)
+    if claimed is not None:
+        return claimed
     sb = get_supabase()
     query = (
         sb.table("articles")
         .select("id, summary")
         .eq("processed", True)
         .eq("scored", False)
+        .eq("unusable", False)
+        .is_("duplicate_of", "null")
         .limit(limit)
     )
     if project_id:
@@ -101,30 +233,80 @@ def mark_scored(article_id: str, score: int, formats: list[str]) -> None:
     ).eq("id", article_id).execute()
 
 
+def mark_scored_bulk(rows: list[dict]) -> None:
+    # rows: {id, judge_score, format_assignments}; one RPC for the whole batch.
+    if not rows:
+        return
+    sb = get_supabase()
+    try:
+        sb.rpc("bulk_mark_scored", {"p_items": rows}).execute()
+        return
+    except Exception:
+        pass
+    for row in rows:
+        mark_scored(row["id"], row["judge_score"], row["format_assignments"])
+
+
 def run_first_judge(limit: int = 20, project_id: str | None = None) -> int:
-    settings = get_settings()
     items = fetch_unscored(limit=limit, project_id=project_id)
+    try:
+        count = _judge_items([item for item in items if item.get("summary")])
+    finally:
+        release_articles(items)
+    stage_done("judge", count)
+    return count
+
+
+def _judge_items(items: list[dict]) -> int:
+    settings = get_settings()
+    batch_size = max(1, settings.judge_batch_size)
     count = 0
-    for item in items:
-        summary = item.get("summary") or ""
-        if not summary:
-            continue
-        result = judge_summary(summary)
-        score = int(result.get("score", 0))
-        formats = ["video"] if score >= settings.video_min_score else []
-        mark_scored(item["id"], score, formats)
-        count += 1
+    done: list[dict] = []
+    try:
+        for i in range(0, len(items), batch_size):
+            batch = items[i : i + batch_size]
+            scores: dict[str, int] = {}
+            if len(batch) > 1:
+                try:
+                    scores = judge_summaries({item["id"]: item["summary"] for item in batch})
+                except Exception:
+                    scores = {}
+            for item in batch:
+                score = scores.get(item["id"])
+                if score is None:
+                    result = judge_summary(item["summary"])
+                    score = int(result.get("score", 0))
+                formats = ["video"] if score >= settings.video_min_score else []
+                done.append({"id": item["id"], "judge_score": score, "format_assignments": formats})
+                count += 1
+            if len(done) >= WRITE_BACK_BATCH:
+                mark_scored_bulk(done)
+                done = []
+    finally:
+        mark_scored_bulk(done)
     return count
 
 
-def fetch_ready_for_generation(limit: int = 10, project_id: str | None = None) -> list[dict]:
+def fetch_ready_for_generation(
+    limit: int = 10,
+    project_id: str | None = None,
+    min_score: int = 0,
+    offset: int = 0,
+) -> list[dict]:
+    # Claimed rows stay leased until released, so the offset only applies to the plain select.
+    claimed = claim_articles("generate", limit, project_id, min_score)
+    if claimed is not None:
+        return claimed
+    # generation_candidates already excludes articles that have a video post.
     sb = get_supabase()
     query = (
-        sb.table("articles")
+        sb.table("generation_candidates")
         .select("id, content, judge_score, project_id")
-        .eq("scored", True)
-        .eq("unusable", False)
-        .limit(limit)
+        .gte("judge_score", min_score)
+        .order("judge_score", desc=True)
+        .order("scraped_at", desc=True)
+        .order("id", desc=False)
+        .range(offset, offset + limit - 1)
     )
     if project_id:
         query = query.eq("project_id", project_id)
@@ -132,30 +314,50 @@ def fetch_ready_for_generation(limit: int = 10, project_id: str | None = None) -
     return resp.data or []
 
 
-def has_video_posts(article_id: str) -> bool:
+def insert_video_posts(
+    article_id: str, variants: list[tuple[str, dict]], project_id: str | None = None
+) -> int:
+    if not variants:
+        return 0
     sb = get_supabase()
-    resp = (
-        sb.table("posts")
-        .select("id")
-        .eq("article_id", article_id)
-        .eq("content_type", "video")
-        .limit(1)
-        .execute()
-    )
-    return bool(resp.data)
+    rows = [
+        {
+            "article_id": article_id,
+            "project_id": project_id,
+            "platform": "tiktok",
+            "content_type": "video",
+            "generating_model": model,
+            "content": content,
+        }
+        for model, content in variants
+    ]
+    resp = sb.table("posts").insert(rows).execute()
+    return len(resp.data or [])
 
 
-def insert_video_post(article_id: str, model: str, content: dict) -> int:
-    sb = get_supabase()
-    row = {
-        "article_id": article_id,
-        "platform": "tiktok",
-        "content_type": "video",
-        "generating_model": model,
-        "content": content,
-    }
-    resp = sb.table("posts").insert(row).execute()
-    return len(resp.data or [])
+@contextmanager
+def _model_slot(model: str):
+    # Caps in-flight generation calls per model so fan-out stays under provider rate limits.
+    with _model_slots_lock:
+        slot = _model_slots.get(model)
+        if slot is None:
+            slot = threading.BoundedSemaphore(max(1, get_settings().generation_model_concurrency))
+            _model_slots[model] = slot
+    with slot:
+        yield
+
+
+def _generate_variant_limited(
+    content: str, model: str, variant_id: int, language: str | None, extra_prompt: str | None
+) -> dict:
+    with _model_slot(model):
+        return generate_video_variant(
+            content,
+            model,
+            variant_id,
+            language=language,
+            extra_prompt=extra_prompt,
+        )
 
 
 def run_generation(limit: int = 10, project_id: str | None = None) -> int:
@@ -163,57 +365,92 @@ def run_generation(limit: int = 10, project_id: str | None = None) -> int:
     models = generation_models()
     if not models:
         return 0
-    model = models[0]
-    items = fetch_ready_for_generation(limit=limit, project_id=project_id)
     count = 0
+    generated = 0
+    # Generated articles drop out of the view, so the offset only advances past skipped rows.
+    offset = 0
     language_cache: dict[str, str | None] = {}
     prompt_cache: dict[str, dict] = {}
-    for item in items:
-        if has_video_posts(item["id"]):
-            continue
-        score = int(item.get("judge_score") or 0)
-        if score < settings.video_min_score:
-            continue
-        content = (item.get("content") or "").strip()
-        if not content:
-            continue
-        language = None
-        prompt_extra = None
-        project_ref = item.get("project_id")
-        if project_ref:
-            if project_ref not in language_cache:
-                language_cache[project_ref] = _project_language(project_ref)
-            if project_ref not in prompt_cache:
-                prompt_cache[project_ref] = _project_prompts(project_ref)
-            language = language_cache.get(project_ref)
-            prompt_extra = (prompt_cache.get(project_ref) or {}).get("video_prompt_extra")
-        for variant_id in range(1, settings.generation_variants + 1):
-            variant = generate_video_variant(
-                content,
-                model,
-                variant_id,
-                language=language,
-                extra_prompt=prompt_extra,
-            )
-            count += insert_video_post(item["id"], model, variant)
+    claimed: list[dict] = []
+    workers = max(1, len(models) * max(1, settings.generation_model_concurrency))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="generate") as pool:
+        try:
+            while generated < limit:
+                items = fetch_ready_for_generation(
+                    limit=limit, project_id=project_id, min_score=settings.video_min_score, offset=offset
+                )
+                if not items:
+                    break
+                claimed.extend(items)
+                for item in items:
+                    if generated >= limit:
+                        break
+                    inserted = _generate_for_article(pool, item, models, settings, language_cache, prompt_cache)
+                    if inserted:
+                        generated += 1
+                        count += inserted
+                    else:
+                        offset += 1
+                if len(items) < limit:
+                    break
+        finally:
+            release_articles(claimed)
+    stage_done("generate", count)
     return count
 
 
+def _generate_for_article(
+    pool: Executor,
+    item: dict,
+    models: list[str],
+    settings: Any,
+    language_cache: dict[str, str | None],
+    prompt_cache: dict[str, dict],
+) -> int:
+    content = (item.get("content") or "").strip()
+    if not content:
+        return 0
+    language = None
+    prompt_extra = None
+    project_ref = item.get("project_id")
+    if project_ref:
+        if project_ref not in language_cache:
+            language_cache[project_ref] = _project_language(project_ref)
+        if project_ref not in prompt_cache:
+            prompt_cache[project_ref] = _project_prompts(project_ref)
+        language = language_cache.get(project_ref)
+        prompt_extra = (prompt_cache.get(project_ref) or {}).get("video_prompt_extra")
+    # Every model x variant runs concurrently; variant ids stay unique per article so the
+    # second judge can map its pick back to a post.
+    per_model = settings.generation_variants
+    futures = {}
+    for model_index, model in enumerate(models):
+        for n in range(1, per_model + 1):
+            variant_id = model_index * per_model + n
+            future = submit(pool, _generate_variant_limited, content, model, variant_id, language, prompt_extra)
+            futures[future] = (variant_id, model)
+    variants: list[tuple[int, str, dict]] = []
+    error: Exception | None = None
+    for future in as_completed(futures):
+        variant_id, model = futures[future]
+        try:
+            variants.append((variant_id, model, future.result()))
+        except Exception as exc:
+            error = exc
+    if not variants and error is not None:
+        raise error
+    variants.sort(key=lambda v: v[0])
+    return insert_video_posts(
+        item["id"], [(model, variant) for _, model, variant in variants], project_id=project_ref
+    )
+
+
 def _project_thresholds(project_id: str | None) -> tuple[int, int]:
     if not project_id:
         return (5, 48)
-    sb = get_supabase()
-    resp = (
-        sb.table("projects")
-        .select("unusable_score_threshold, unusable_age_hours")
-        .eq("id", project_id)
-        .limit(1)
-        .execute()
-    )
-    data = resp.data or []
-    if not data:
+    row = get_project(project_id)
+    if not row:
         return (5, 48)
-    row = data[0]
     score = int(row.get("unusable_score_threshold") or 5)
     hours = int(row.get("unusable_age_hours") or 48)
     return (score, hours)
@@ -222,88 +459,195 @@ def _project_thresholds(project_id: str | None) -> tuple[int, int]:
 def mark_low_score_unusable(project_id: str) -> int:
     sb = get_supabase()
     score_threshold, age_hours = _project_thresholds(project_id)
+    try:
+        resp = sb.rpc(
+            "mark_project_low_score_unusable",
+            {"p_project_id": project_id, "p_score_threshold": score_threshold, "p_age_hours": age_hours},
+        ).execute()
+        return int(resp.data or 0)
+    except Exception:
+        pass
+    # Without the RPC: one filtered bulk update.
     cutoff = datetime.now(timezone.utc) - timedelta(hours=age_hours)
-    items = (
+    resp = (
         sb.table("articles")
-        .select("id, judge_score, scraped_at")
+        .update(
+            {
+                "unusable": True,
+                "unusable_reason": f"low_score_age(score<{score_threshold},>{age_hours}h)",
+                "unusable_at": _now(),
+            }
+        )
         .eq("project_id", project_id)
         .eq("scored", True)
         .eq("unusable", False)
         .lt("judge_score", score_threshold)
         .lt("scraped_at", cutoff.isoformat())
         .execute()
+    )
+    return len(resp.data or [])
+
+
+def dedupe_articles(project_id: str) -> int:
+    sb = get_supabase()
+    try:
+        resp = sb.rpc("dedupe_project_articles", {"p_project_id": project_id}).execute()
+        return int(resp.data or 0)
+    except Exception:
+        return _dedupe_articles_fallback(project_id)
+
+
+def _dedupe_articles_fallback(project_id: str) -> int:
+    sb = get_supabase()
+    items = (
+        sb.table("articles")
+        .select("id, content_hash, judge_score, scraped_at")
+        .eq("project_id", project_id)
+        .eq("unusable", False)
+        .not_.is_("content_hash", "null")
+        .execute()
         .data
         or []
     )
-    count = 0
+    groups: dict[str, list[dict]] = {}
     for item in items:
+        if item.get("content_hash"):
+            groups.setdefault(item["content_hash"], []).append(item)
+    count = 0
+    for group in groups.values():
+        if len(group) <= 1:
+            continue
+        group.sort(key=lambda r: (int(r.get("judge_score") or 0), r.get("scraped_at") or ""), reverse=True)
+        dup_ids = [row["id"] for row in group[1:]]
         sb.table("articles").update(
             {
                 "unusable": True,
-                "unusable_reason": f"low_score_age(score<{score_threshold},>{age_hours}h)",
+                "unusable_reason": "duplicate",
+                "duplicate_of": group[0]["id"],
                 "unusable_at": _now(),
             }
-        ).eq("id", item["id"]).execute()
-        count += 1
+        ).in_("id", dup_ids).execute()
+        count += len(dup_ids)
     return count
 
 
-def dedupe_articles(project_id: str) -> int:
+def dedupe_before_extraction(project_id: str, limit: int = 1000) -> int:
+    # Exact-hash duplicates among not-yet-extracted articles, resolved before any LLM call.
+    # The canonical copy is the one already extracted, else the oldest.
     sb = get_supabase()
-    items = (
+    pending = (
         sb.table("articles")
-        .select("id, content_hash, judge_score, scraped_at, unusable")
+        .select("content_hash")
         .eq("project_id", project_id)
+        .eq("processed", False)
         .eq("unusable", False)
-        .neq("content_hash", None)
+        .is_("duplicate_of", "null")
+        .not_.is_("content_hash", "null")
+        .limit(limit)
         .execute()
         .data
         or []
     )
-    if not items:
-        return 0
-    groups: dict[str, list[dict]] = {}
-    for item in items:
-        h = item.get("content_hash")
-        if not h:
-            continue
-        groups.setdefault(h, []).append(item)
+    hashes = list({row["content_hash"] for row in pending if row.get("content_hash")})
+    dup_ids_by_keep: dict[str, list[str]] = {}
+    for i in range(0, len(hashes), 50):
+        rows = (
+            sb.table("articles")
+            .select("id, content_hash, processed, created_at")
+            .eq("project_id", project_id)
+            .in_("content_hash", hashes[i : i + 50])
+            .is_("duplicate_of", "null")
+            .eq("unusable", False)
+            .execute()
+            .data
+            or []
+        )
+        groups: dict[str, list[dict]] = {}
+        for row in rows:
+            groups.setdefault(row["content_hash"], []).append(row)
+        for group in groups.values():
+            if len(group) <= 1:
+                continue
+            group.sort(key=lambda r: (not r.get("processed"), r.get("created_at") or ""))
+            dup_ids = [dup["id"] for dup in group[1:] if not dup.get("processed")]
+            if dup_ids:
+                dup_ids_by_keep.setdefault(group[0]["id"], []).extend(dup_ids)
     count = 0
-    for h, group in groups.items():
-        if len(group) <= 1:
-            continue
-        def key(row: dict) -> tuple[int, str]:
-            score = int(row.get("judge_score") or 0)
-            scraped = row.get("scraped_at") or ""
-            return (score, scraped)
-        group_sorted = sorted(group, key=key, reverse=True)
-        keep = group_sorted[0]
-        for dup in group_sorted[1:]:
+    for keep_id, dup_ids in dup_ids_by_keep.items():
+        for i in range(0, len(dup_ids), 200):
+            chunk = dup_ids[i : i + 200]
             sb.table("articles").update(
                 {
                     "unusable": True,
                     "unusable_reason": "duplicate",
-                    "duplicate_of": keep["id"],
+                    "duplicate_of": keep_id,
                     "unusable_at": _now(),
                 }
-            ).eq("id", dup["id"]).execute()
-            count += 1
+            ).in_("id", chunk).execute()
+            count += len(chunk)
     return count
 
 
 def fetch_for_second_judge(limit: int = 20) -> list[dict]:
+    # Returns every variant of up to `limit` articles so pick_winner always sees whole groups.
     sb = get_supabase()
+    pending = (
+        sb.table("posts")
+        .select("article_id")
+        .eq("content_type", "video")
+        .eq("selected", False)
+        .is_("second_judged_at", "null")
+        .order("created_at", desc=False)
+        .limit(limit * 10)
+        .execute()
+        .data
+        or []
+    )
+    article_ids: list[str] = []
+    for row in pending:
+        article_id = row.get("article_id")
+        if article_id and article_id not in article_ids:
+            article_ids.append(article_id)
+        if len(article_ids) >= limit:
+            break
+    if not article_ids:
+        return []
+    decided = (
+        sb.table("posts")
+        .select("article_id")
+        .in_("article_id", article_ids)
+        .eq("content_type", "video")
+        .eq("selected", True)
+        .execute()
+        .data
+        or []
+    )
+    decided_ids = list({row["article_id"] for row in decided if row.get("article_id")})
+    if decided_ids:
+        # Group already has a winner: retire its leftover variants instead of judging again.
+        sb.table("posts").update({"second_judged_at": _now()}).in_("article_id", decided_ids).eq(
+            "content_type", "video"
+        ).is_("second_judged_at", "null").execute()
+    open_ids = [article_id for article_id in article_ids if article_id not in decided_ids]
+    if not open_ids:
+        return []
     resp = (
         sb.table("posts")
         .select("id, article_id, content_type, generating_model, content, selected")
-        .eq("selected", False)
+        .in_("article_id", open_ids)
         .eq("content_type", "video")
-        .limit(limit)
         .execute()
     )
     return resp.data or []
 
 
+def mark_posts_second_judged(post_ids: list[str]) -> None:
+    if not post_ids:
+        return
+    sb = get_supabase()
+    sb.table("posts").update({"second_judged_at": _now()}).in_("id", post_ids).execute()
+
+
 def group_versions(items: list[dict]) -> dict:
     grouped: dict = {}
     for item in items:
@@ -336,34 +680,76 @@ def mark_post_selected(post_id: str) -> None:
 
 
 def update_model_performance(model: str, content_type: str, winner: bool) -> None:
+    sb = get_supabase()
+    sb.rpc(
+        "update_model_performance",
+        {"p_model_name": model, "p_content_type": content_type, "p_is_winner": winner},
+    ).execute()
+
+
+def update_model_performance_bulk(tallies: dict[tuple[str, str], list[int]]) -> None:
+    # tallies: (model, content_type) -> [wins, total]
+    if not tallies:
+        return
+    deltas = [
+        {"model_name": model, "content_type": content_type, "wins": wins, "total": total}
+        for (model, content_type), (wins, total) in tallies.items()
+    ]
     sb = get_supabase()
     try:
-        sb.rpc(
-            "update_model_performance",
-            {"p_model_name": model, "p_content_type": content_type, "p_is_winner": winner},
-        ).execute()
-    except Exception:
-        # If RPC not available, skip silently for MVP
+        sb.rpc("update_model_performance_bulk", {"p_deltas": deltas}).execute()
         return
+    except Exception as exc:
+        # Any other failure may have committed; replaying per variant would double count.
+        if not _rpc_missing(exc):
+            raise
+    # Older databases only have the per-variant RPC; its errors are not swallowed.
+    for (model, content_type), (wins, total) in tallies.items():
+        for i in range(total):
+            update_model_performance(model, content_type, i < wins)
 
 
 def run_second_judge(limit: int = 20) -> int:
+    settings = get_settings()
     items = fetch_for_second_judge(limit=limit)
     grouped = group_versions(items)
+    if not grouped:
+        return 0
     count = 0
-    for (article_id, fmt), versions in grouped.items():
-        decision = pick_winner(fmt, versions)
-        winner_variant = decision.get("winner_variant") or decision.get("winner")
-        # pick matching post id by variant
-        winner_post = next(
-            (v for v in versions if v.get("variant_id") == winner_variant), None
-        )
-        if not winner_post:
-            winner_post = versions[0]
-        mark_post_selected(winner_post["id"])
-        for v in versions:
-            update_model_performance(v["model"], fmt, v["id"] == winner_post["id"])
-        count += 1
+    tallies: dict[tuple[str, str], list[int]] = {}
+    workers = max(1, min(settings.second_judge_concurrency, len(grouped)))
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="second-judge") as pool:
+            futures = {
+                submit(pool, pick_winner, fmt, versions): (fmt, versions)
+                for (article_id, fmt), versions in grouped.items()
+            }
+            for future in as_completed(futures):
+                fmt, versions = futures[future]
+                decision = future.result()
+                winner_variant = decision.get("winner_variant") or decision.get("winner")
+                # pick matching post id by variant
+                winner_post = next(
+                    (v for v in versions if v.get("variant_id") == winner_variant), None
+                )
+                if not winner_post:
+                    winner_post = versions[0]
+                mark_post_selected(winner_post["id"])
+                mark_posts_second_judged([v["id"] for v in versions])
+                for v in versions:
+                    tally = tallies.setdefault((v["model"], fmt), [0, 0])
+                    tally[0] += 1 if v["id"] == winner_post["id"] else 0
+                    tally[1] += 1
+                count += 1
+    except Exception as exc:
+        # Groups already marked selected must still be counted if a later pick fails,
+        # without a flush error replacing the original one.
+        try:
+            update_model_performance_bulk(tallies)
+        except Exception as flush_exc:
+            exc.add_note(f"model performance flush failed: {type(flush_exc).__name__}: {flush_exc}")
+        raise
+    update_model_performance_bulk(tallies)
     return count
 
 
@@ -374,7 +760,7 @@ def fetch_for_audio_roundup(
     since = datetime.now(timezone.utc) - timedelta(hours=hours)
     query = (
         sb.table("articles")
-        .select("id, title, summary, content, judge_score, scraped_at")
+        .select("id, project_id, title, summary, content, judge_score, scraped_at")
         .eq("processed", True)
         .eq("scored", True)
         .eq("unusable", False)
@@ -403,10 +789,11 @@ def fetch_for_audio_roundup(
     return filtered[:limit]
 
 
-def insert_audio_roundup(model: str, content: dict) -> dict | None:
+def insert_audio_roundup(model: str, content: dict, project_id: str | None = None) -> dict | None:
     sb = get_supabase()
     row = {
         "article_id": None,
+        "project_id": project_id,
         "platform": "youtube",
         "content_type": "audio_roundup",
         "generating_model": model,
@@ -418,32 +805,21 @@ def insert_audio_roundup(model: str, content: dict) -> dict | None:
 
 
 def _project_language(project_id: str) -> str | None:
-    sb = get_supabase()
-    resp = (
-        sb.table("projects")
-        .select("language")
-        .eq("id", project_id)
-        .limit(1)
-        .execute()
-    )
-    data = resp.data or []
-    return data[0].get("language") if data else None
+    row = get_project(project_id)
+    return row.get("language") if row else None
 
 
 def _project_prompts(project_id: str) -> dict:
-    sb = get_supabase()
     try:
-        resp = (
-            sb.table("projects")
-            .select("video_prompt_extra,audio_roundup_prompt_extra")
-            .eq("id", project_id)
-            .limit(1)
-            .execute()
-        )
+        row = get_project(project_id)
     except Exception:
         return {}
-    data = resp.data or []
-    return data[0] if data else {}
+    if not row:
+        return {}
+    return {
+        "video_prompt_extra": row.get("video_prompt_extra"),
+        "audio_roundup_prompt_extra": row.get("audio_roundup_prompt_extra"),
+    }
 
 
 def _tts_voice_pairs() -> list[tuple[str, str]]:
@@ -497,15 +873,20 @@ def _next_tts_combo() -> tuple[int, str, str] | None:
 def run_audio_roundup(project_id: str | None = None, language: str | None = None) -> int:
     settings = get_settings()
     prompt_extra = None
-    if project_id and not language:
-        language = _project_language(project_id)
-    if project_id:
-        prompt_extra = _project_prompts(project_id).get("audio_roundup_prompt_extra")
     items = fetch_for_audio_roundup(
         limit=settings.audio_roundup_size, hours=settings.audio_roundup_hours, project_id=project_id
     )
     if not items:
         return 0
+    if not project_id:
+        # Roundups belong to one project: take the top-scored story's project and keep only
+        # its stories, so the post is never stored without a project_id.
+        project_id = items[0].get("project_id")
+        items = [item for item in items if item.get("project_id") == project_id]
+    if project_id and not language:
+        language = _project_language(project_id)
+    if project_id:
+        prompt_extra = _project_prompts(project_id).get("audio_roundup_prompt_extra")
     stories = []
     for item in items:
         summary = item.get("summary") or ""
@@ -528,7 +909,7 @@ def run_audio_roundup(project_id: str | None = None, language: str | None = None
         provider = (settings.tts_provider or "openai").lower()
         content["tts_provider"] = provider
         content["tts_model"] = settings.inworld_tts_model if provider == "inworld" else settings.tts_model
-    post = insert_audio_roundup(settings.audio_roundup_model, content)
+    post = insert_audio_roundup(settings.audio_roundup_model, content, project_id=project_id)
     if post:
         usage_rows = [
             {
@@ -565,56 +946,14 @@ def fetch_latest_audio_roundup_for_project(project_id: str) -> dict | None:
     resp = (
         sb.table("posts")
         .select("id, content, created_at")
+        .eq("project_id", project_id)
         .eq("content_type", "audio_roundup")
         .order("created_at", desc=True)
-        .limit(50)
-        .execute()
-    )
-    candidates = resp.data or []
-    if not candidates:
-        return None
-    post_ids = [row.get("id") for row in candidates if row.get("id")]
-    if not post_ids:
-        return None
-    usage = (
-        sb.table("article_usage")
-        .select("post_id, article_id")
-        .in_("post_id", post_ids)
-        .execute()
-        .data
-        or []
-    )
-    if not usage:
-        return None
-    article_ids = [row.get("article_id") for row in usage if row.get("article_id")]
-    if not article_ids:
-        return None
-    articles = (
-        sb.table("articles")
-        .select("id, project_id")
-        .in_("id", article_ids)
+        .limit(1)
         .execute()
-        .data
-        or []
     )
-    project_lookup = {row["id"]: row.get("project_id") for row in articles if row.get("id")}
-    post_projects: dict[str, set[str]] = {}
-    for row in usage:
-        post_id = row.get("post_id")
-        article_id = row.get("article_id")
-        if not post_id or not article_id:
-            continue
-        project = project_lookup.get(article_id)
-        if not project:
-            continue
-        post_projects.setdefault(post_id, set()).add(project)
-
-    for row in candidates:
-        post_id = row.get("id")
-        projects = post_projects.get(post_id) or set()
-        if project_id in projects:
-            return row
-    return None
+    data = resp.data or []
+    return data[0] if data else None
 
 
 def fetch_latest_selected_video() -> dict | None:
@@ -641,76 +980,105 @@ def _chunk_ids(values: list[str], size: int = 200) -> list[list[str]]:
     return [values[i : i + size] for i in range(0, len(values), size)]
 
 
-def cleanup_old_data(
-    hours: int = 48,
-    delete_legacy: bool = True,
-    wipe_unusable: bool = True,
-) -> dict:
+def _delete_older_than(
+    table: str,
+    column: str,
+    cutoff_iso: str,
+    batch_size: int,
+    progress: Callable[[str, dict], None] | None = None,
+) -> int:
+    # Keyset over id; each statement deletes at most one batch so no long-held locks.
     sb = get_supabase()
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-    cutoff_iso = cutoff.isoformat()
-    summary: dict[str, int] = {}
-
-    if delete_legacy:
-        resp = sb.table("category_pages").delete().lt("scraped_at", cutoff_iso).execute()
-        summary["category_pages_deleted"] = len(resp.data or [])
-        resp = sb.table("article_urls").delete().lt("discovered_at", cutoff_iso).execute()
-        summary["article_urls_deleted"] = len(resp.data or [])
-
-    resp = sb.table("source_items").delete().lt("scraped_at", cutoff_iso).execute()
-    summary["source_items_deleted"] = len(resp.data or [])
+    deleted = 0
+    last_id: str | None = None
+    while True:
+        query = sb.table(table).select("id").lt(column, cutoff_iso).order("id").limit(batch_size)
+        if last_id:
+            query = query.gt("id", last_id)
+        ids = [row["id"] for row in query.execute().data or [] if row.get("id")]
+        if not ids:
+            break
+        last_id = ids[-1]
+        for chunk in _chunk_ids(ids):
+            resp = sb.table(table).delete().in_("id", chunk).execute()
+            deleted += len(resp.data or [])
+        if progress:
+            progress(table, {"deleted": deleted})
+        if len(ids) < batch_size:
+            break
+    return deleted
 
-    if not wipe_unusable:
-        return summary
 
-    ids: list[str] = []
-    page_size = 500
-    offset = 0
+def _wipe_unusable_articles(
+    cutoff_iso: str,
+    batch_size: int,
+    progress: Callable[[str, dict], None] | None = None,
+) -> int:
+    sb = get_supabase()
+    wiped = 0
+    scanned = 0
+    last_id: str | None = None
     while True:
-        resp = (
+        query = (
             sb.table("articles")
             .select("id")
             .eq("unusable", True)
             .lt("scraped_at", cutoff_iso)
-            .range(offset, offset + page_size - 1)
-            .execute()
+            .or_("raw_html.not.is.null,content.not.is.null")
+            .order("id")
+            .limit(batch_size)
         )
-        batch = resp.data or []
-        if not batch:
+        if last_id:
+            query = query.gt("id", last_id)
+        ids = [row["id"] for row in query.execute().data or [] if row.get("id")]
+        if not ids:
             break
-        ids.extend([row["id"] for row in batch if row.get("id")])
-        if len(batch) < page_size:
+        last_id = ids[-1]
+        scanned += len(ids)
+        blocked: set[str] = set()
+        for chunk in _chunk_ids(ids):
+            for table in ("posts", "article_usage"):
+                rows = sb.table(table).select("article_id").in_("article_id", chunk).execute().data or []
+                blocked.update(row["article_id"] for row in rows if row.get("article_id"))
+        to_wipe = [article_id for article_id in ids if article_id not in blocked]
+        for chunk in _chunk_ids(to_wipe):
+            sb.table("articles").update({"raw_html": None, "content": None}).in_("id", chunk).execute()
+        wiped += len(to_wipe)
+        if progress:
+            progress("articles", {"scanned": scanned, "wiped": wiped})
+        if len(ids) < batch_size:
             break
-        offset += page_size
+    return wiped
 
-    if not ids:
-        summary["articles_wiped"] = 0
-        return summary
 
-    posts = (
-        sb.table("posts")
-        .select("article_id")
-        .in_("article_id", ids)
-        .execute()
-        .data
-        or []
-    )
-    usage = (
-        sb.table("article_usage")
-        .select("article_id")
-        .in_("article_id", ids)
-        .execute()
-        .data
-        or []
+def cleanup_old_data(
+    hours: int = 48,
+    delete_legacy: bool = True,
+    wipe_unusable: bool = True,
+    batch_size: int = 500,
+    progress: Callable[[str, dict], None] | None = None,
+) -> dict:
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+    cutoff_iso = cutoff.isoformat()
+    batch_size = max(1, batch_size)
+    summary: dict[str, int] = {}
+
+    if delete_legacy:
+        summary["category_pages_deleted"] = _delete_older_than(
+            "category_pages", "scraped_at", cutoff_iso, batch_size, progress
+        )
+        summary["article_urls_deleted"] = _delete_older_than(
+            "article_urls", "discovered_at", cutoff_iso, batch_size, progress
+        )
+
+    summary["source_items_deleted"] = _delete_older_than(
+        "source_items", "scraped_at", cutoff_iso, batch_size, progress
     )
-    blocked = {row["article_id"] for row in posts if row.get("article_id")}
-    blocked.update({row["article_id"] for row in usage if row.get("article_id")})
 
-    to_wipe = [article_id for article_id in ids if article_id not in blocked]
-    for chunk in _chunk_ids(to_wipe, size=200):
-        sb.table("articles").update({"raw_html": None, "content": None}).in_("id", chunk).execute()
+    if not wipe_unusable:
+        return summary
 
-    summary["articles_wiped"] = len(to_wipe)
+    summary["articles_wiped"] = _wipe_unusable_articles(cutoff_iso, batch_size, progress)
     return summary
 
 
@@ -720,7 +1088,9 @@ def log_pipeline_run(
     status: str = "ok",
     started_at: str | None = None,
     finished_at: str | None = None,
-) -> None:
+    error: str | None = None,
+    stages: list[dict] | None = None,
+) -> str | None:
     sb = get_supabase()
     payload = {
         "project_id": project_id,
@@ -732,57 +1102,100 @@ def log_pipeline_run(
         "judge_count": int(results.get("judge") or 0),
         "dedupe_count": int(results.get("dedupe") or 0),
         "unusable_count": int(results.get("unusable") or 0),
+        "llm_calls_avoided": int(results.get("llm_calls_avoided") or 0),
         "started_at": started_at or _now(),
         "finished_at": finished_at or _now(),
     }
+    if error:
+        payload["error"] = error[:2000]
     try:
-        sb.table("pipeline_runs").insert(payload).execute()
+        data = sb.table("pipeline_runs").insert(payload).execute().data or []
     except Exception:
         # Logging is best-effort; do not break pipeline on insert failure.
-        return
+        return None
+    run_id = data[0].get("id") if data else None
+    if run_id and stages:
+        rows = [{**row, "run_id": run_id, "project_id": project_id} for row in stages]
+        try:
+            sb.table("pipeline_stage_runs").insert(rows).execute()
+        except Exception:
+            pass
+    return run_id
 
 
 def run_project_pipeline(project_id: str, max_items: int = 10) -> dict:
     started_at = _now()
     results: dict = {}
-    scrape_results = scrape_project(project_id, max_items=max_items)
-    results["scrape"] = [r.__dict__ for r in scrape_results]
-    results["ingest"] = ingest_source_items(limit=50, fetch_full=True, project_id=project_id)
-    extract_total = 0
-    judge_total = 0
-    max_extract = 200
-    max_judge = 500
-    while extract_total < max_extract:
-        count = run_extraction(limit=20, project_id=project_id)
-        extract_total += count
-        if count == 0:
-            break
-    while judge_total < max_judge:
-        count = run_first_judge(limit=50, project_id=project_id)
-        judge_total += count
-        if count == 0:
-            break
-    results["extract"] = extract_total
-    results["judge"] = judge_total
-    results["dedupe"] = dedupe_articles(project_id)
-    results["unusable"] = mark_low_score_unusable(project_id)
+    with collect() as stages:
+        try:
+            with stage("scrape") as row:
+                scrape_results = scrape_project(project_id, max_items=max_items)
+                results["scrape"] = [r.__dict__ for r in scrape_results]
+                row["items"] = len(scrape_results)
+            ingest_stats: dict = {}
+            with stage("ingest") as row:
+                results["ingest"] = ingest_source_items(
+                    limit=50, fetch_full=True, project_id=project_id, stats=ingest_stats
+                )
+                row["items"] = int(results["ingest"] or 0)
+            with stage("pre_dedupe") as row:
+                row["items"] = dedupe_before_extraction(project_id)
+            # Anything marked duplicate before extraction skips one extraction and one judge call.
+            early_dupes = int(ingest_stats.get("duplicates") or 0) + row["items"]
+            results["llm_calls_avoided"] = early_dupes * 2
+            extract_total = 0
+            judge_total = 0
+            max_extract = 200
+            max_judge = 500
+            with stage("extract") as row:
+                while extract_total < max_extract:
+                    count = run_extraction(limit=20, project_id=project_id)
+                    extract_total += count
+                    if count == 0:
+                        break
+                row["items"] = extract_total
+            with stage("judge") as row:
+                while judge_total < max_judge:
+                    count = run_first_judge(limit=50, project_id=project_id)
+                    judge_total += count
+                    if count == 0:
+                        break
+                row["items"] = judge_total
+            results["extract"] = extract_total
+            results["judge"] = judge_total
+            with stage("dedupe") as row:
+                row["items"] = dedupe_articles(project_id)
+            results["dedupe"] = early_dupes + row["items"]
+            with stage("unusable") as row:
+                row["items"] = results["unusable"] = mark_low_score_unusable(project_id)
+        except Exception as exc:
+            # Stages finished before the failure are still recorded against the error run.
+            error = f"{type(exc).__name__}: {exc}"
+            log_pipeline_run(project_id, results, status="error", started_at=started_at, error=error, stages=stages)
+            raise
     finished_at = _now()
-    log_pipeline_run(project_id, results, started_at=started_at, finished_at=finished_at)
+    log_pipeline_run(project_id, results, started_at=started_at, finished_at=finished_at, stages=stages)
+    results["stages"] = stages
     return results
 
 
+def _run_project_isolated(project: dict, max_items: int) -> dict:
+    # One project's failure is reported without stopping the others; run_project_pipeline logs it.
+    project_id = project["id"]
+    row = {"project_id": project_id, "name": project.get("name")}
+    try:
+        row["results"] = run_project_pipeline(project_id, max_items=max_items)
+    except Exception as exc:
+        row["results"] = {}
+        row["error"] = f"{type(exc).__name__}: {exc}"
+    return row
+
+
 def run_pipeline_all(max_items: int = 10) -> list[dict]:
-    results: list[dict] = []
-    projects = list_projects()
-    for project in projects:
-        project_id = project.get("id")
-        if not project_id:
-            continue
-        results.append(
-            {
-                "project_id": project_id,
-                "name": project.get("name"),
-                "results": run_project_pipeline(project_id, max_items=max_items),
-            }
-        )
-    return results
+    projects = [project for project in list_projects() if project.get("id")]
+    workers = max(1, min(get_settings().pipeline_workers, len(projects) or 1))
+    if workers == 1:
+        return [_run_project_isolated(project, max_items) for project in projects]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeline") as pool:
+        futures = [pool.submit(_run_project_isolated, project, max_items) for project in projects]
+        return [future.result() for future in futures]
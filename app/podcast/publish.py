@@ -11,9 +11,10 @@ from app.media.paths import podcast_image_path, roundup_audio_path
 from app.media.roundup_video import ensure_project_podcast_image
 from app.podcast.meta import PodcastMeta, get_meta_for_project
 from app.podcast.rss import PodcastEpisode, build_rss
+from app.project_cache import get_project
 from app.storage.r2 import upload_file, upload_text, public_url
 from app.config import get_settings
-import requests
+from app.http_client import get_session
 
 
 @dataclass
@@ -47,10 +48,7 @@ def _parse_iso(value: str | None) -> datetime:
 
 
 def _project_row(project_id: str) -> dict | None:
-    sb = get_supabase()
-    resp = sb.table("projects").select("id,name").eq("id", project_id).limit(1).execute()
-    data = resp.data or []
-    return data[0] if data else None
+    return get_project(project_id)
 
 
 def _project_meta(project_name: str) -> PodcastMeta | None:
@@ -59,49 +57,16 @@ def _project_meta(project_name: str) -> PodcastMeta | None:
 
 def _project_roundups(project_id: str, limit: int = 30) -> list[dict]:
     sb = get_supabase()
-    posts = (
+    resp = (
         sb.table("posts")
         .select("id, content, created_at, podcast_url, podcast_posted, podcast_published_at")
+        .eq("project_id", project_id)
         .eq("content_type", "audio_roundup")
         .order("created_at", desc=True)
-        .limit(200)
+        .limit(limit)
         .execute()
-        .data
-        or []
     )
-    if not posts:
-        return []
-    post_ids = [p.get("id") for p in posts if p.get("id")]
-    usage = (
-        sb.table("article_usage")
-        .select("post_id, article_id")
-        .in_("post_id", post_ids)
-        .execute()
-        .data
-        or []
-    )
-    article_ids = list({u.get("article_id") for u in usage if u.get("article_id")})
-    if not article_ids:
-        return []
-    articles = (
-        sb.table("articles")
-        .select("id, project_id")
-        .in_("id", article_ids)
-        .execute()
-        .data
-        or []
-    )
-    article_project = {a["id"]: a.get("project_id") for a in articles if a.get("id")}
-    post_projects: dict[str, set[str]] = {}
-    for row in usage:
-        post_id = row.get("post_id")
-        article_id = row.get("article_id")
-        if post_id and article_id:
-            proj = article_project.get(article_id)
-            if proj:
-                post_projects.setdefault(post_id, set()).add(proj)
-    filtered = [p for p in posts if project_id in (post_projects.get(p.get("id")) or set())]
-    return filtered[:limit]
+    return resp.data or []
 
 
 def _ensure_audio_file(post_id: str, content: dict) -> Path:
@@ -119,7 +84,7 @@ def _ensure_audio_file(post_id: str, content: dict) -> Path:
 
 def _remote_length(url: str) -> int:
     try:
-        resp = requests.head(url, timeout=10)
+        resp = get_session().head(url, timeout=10)
         if not resp.ok:
             return 0
         length = resp.headers.get("Content-Length")
@@ -203,19 +168,7 @@ def publish_podcast_for_project(project_id: str, refresh: bool = False) -> Publi
 
     settings = get_settings()
     image_url = None
-    prompt = None
-    sb = get_supabase()
-    prompt_row = (
-        sb.table("projects")
-        .select("podcast_image_prompt")
-        .eq("id", project_id)
-        .limit(1)
-        .execute()
-        .data
-        or []
-    )
-    if prompt_row:
-        prompt = prompt_row[0].get("podcast_image_prompt")
+    prompt = (get_project(project_id) or {}).get("podcast_image_prompt")
     image_path = None
     if prompt and (settings.enable_image_generation or podcast_image_path(Path(settings.media_output_dir), project_id).exists()):
         try:
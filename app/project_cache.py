@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+
+from .config import get_settings
+from .db import get_supabase
+
+_cache: dict[str, tuple[float, dict | None]] = {}
+_lock = threading.Lock()
+
+
+def get_project(project_id: str) -> dict | None:
+    # Project rows change rarely but are read by every stage; serve them from a TTL cache.
+    # Callers get their own copy so edits to a row (or its config) never leak into the cache.
+    ttl = get_settings().project_cache_ttl_seconds
+    now = time.monotonic()
+    if ttl > 0:
+        with _lock:
+            hit = _cache.get(project_id)
+        if hit and now - hit[0] < ttl:
+            return copy.deepcopy(hit[1])
+    sb = get_supabase()
+    resp = sb.table("projects").select("*").eq("id", project_id).limit(1).execute()
+    data = resp.data or []
+    row = data[0] if data else None
+    if ttl > 0:
+        with _lock:
+            _cache[project_id] = (now, copy.deepcopy(row))
+    return row
+
+
+def invalidate_project(project_id: str | None = None) -> None:
+    with _lock:
+        if project_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(project_id, None)
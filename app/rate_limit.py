@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from .config import get_settings
+
+THROTTLE_STATUSES = {429, 503}
+MAX_RETRY_AFTER_SECONDS = 600.0
+# Lowest allowed rate: rates are used as divisors, so 0 from the env would crash acquire().
+RATE_FLOOR = 0.01
+
+
+def _domain(url: str) -> str:
+    host = (urlparse(url).netloc or "").lower().split(":", 1)[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except Exception:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.streak = 0
+        self.requests = 0
+        self.throttled = 0
+        self.failed = 0
+        self.waited_seconds = 0.0
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class DomainLimiter:
+    # Token bucket per domain. Halves the rate on 429/503 (honouring Retry-After) and on
+    # failed requests, and grows it again by 25% after every `recover_after` clean responses.
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        min_rate: float,
+        max_rate: float,
+        recover_after: int = 20,
+    ) -> None:
+        self._min_rate = max(RATE_FLOOR, min_rate)
+        self._rate = max(self._min_rate, rate)
+        self._burst = max(1.0, burst)
+        self._max_rate = max(self._rate, max_rate)
+        self._recover_after = max(1, recover_after)
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, domain: str) -> _Bucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = _Bucket(self._rate, self._burst)
+            self._buckets[domain] = bucket
+        return bucket
+
+    def acquire(self, url: str) -> float:
+        domain = _domain(url)
+        waited = 0.0
+        while True:
+            with self._lock:
+                bucket = self._bucket(domain)
+                now = time.monotonic()
+                bucket.refill(now)
+                if now < bucket.blocked_until:
+                    delay = bucket.blocked_until - now
+                elif bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    bucket.requests += 1
+                    bucket.waited_seconds += waited
+                    return waited
+                else:
+                    delay = (1 - bucket.tokens) / bucket.rate
+            time.sleep(delay)
+            waited += delay
+
+    def record(self, url: str, status_code: int | None, retry_after: str | None = None) -> None:
+        # status_code None means the request itself failed (timeout, reset, refused).
+        domain = _domain(url)
+        with self._lock:
+            bucket = self._bucket(domain)
+            now = time.monotonic()
+            if status_code is None or status_code in THROTTLE_STATUSES:
+                if status_code is None:
+                    bucket.failed += 1
+                else:
+                    bucket.throttled += 1
+                bucket.streak = 0
+                bucket.rate = max(self._min_rate, bucket.rate / 2)
+                bucket.tokens = 0.0
+                pause = _parse_retry_after(retry_after)
+                if pause is None:
+                    pause = 1 / bucket.rate
+                pause = min(pause, MAX_RETRY_AFTER_SECONDS)
+                bucket.blocked_until = max(bucket.blocked_until, now + pause)
+                return
+            if status_code >= 500:
+                bucket.streak = 0
+                return
+            bucket.streak += 1
+            if bucket.streak >= self._recover_after and bucket.rate < self._max_rate:
+                bucket.rate = min(self._max_rate, bucket.rate * 1.25)
+                bucket.streak = 0
+
+    def snapshot(self) -> list[dict]:
+        now = time.monotonic()
+        with self._lock:
+            rows = [
+                {
+                    "domain": domain,
+                    "rate_per_second": round(bucket.rate, 3),
+                    "tokens": round(min(bucket.burst, bucket.tokens + (now - bucket.updated) * bucket.rate), 2),
+                    "blocked_for_seconds": round(max(0.0, bucket.blocked_until - now), 1),
+                    "success_streak": bucket.streak,
+                    "requests": bucket.requests,
+                    "throttled": bucket.throttled,
+                    "failed": bucket.failed,
+                    "waited_seconds": round(bucket.waited_seconds, 1),
+                }
+                for domain, bucket in self._buckets.items()
+            ]
+        rows.sort(key=lambda r: (r["throttled"], r["requests"]), reverse=True)
+        return rows
+
+
+@lru_cache(maxsize=1)
+def get_limiter() -> DomainLimiter:
+    settings = get_settings()
+    return DomainLimiter(
+        rate=settings.rate_limit_per_domain,
+        burst=settings.rate_limit_burst,
+        min_rate=settings.rate_limit_min_per_domain,
+        max_rate=settings.rate_limit_max_per_domain,
+    )
+
+
+def limiter_state() -> list[dict]:
+    return get_limiter().snapshot()
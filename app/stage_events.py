@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from .config import get_settings
+
+CHANNEL = "pipeline_stage"
+NEXT_STAGE = {
+    "ingest": "extract",
+    "extract": "judge",
+    "judge": "generate",
+    "generate": "second_judge",
+}
+
+_events: dict[str, threading.Event] = {}
+_events_lock = threading.Lock()
+_listener: threading.Thread | None = None
+_listening = threading.Event()
+_notify_conn = None
+_notify_lock = threading.Lock()
+
+
+def _event(stage: str) -> threading.Event:
+    with _events_lock:
+        event = _events.get(stage)
+        if event is None:
+            event = threading.Event()
+            _events[stage] = event
+        return event
+
+
+def notify(stage: str) -> None:
+    # With an active LISTEN in this process the NOTIFY round trip is the only wakeup;
+    # setting the local event as well would wake the waiter twice for one stage_done.
+    dsn = get_settings().database_url
+    if dsn:
+        try:
+            _send_notify(dsn, stage)
+        except Exception:
+            pass
+        else:
+            if _listening.is_set():
+                return
+    _event(stage).set()
+
+
+def _send_notify(dsn: str, stage: str) -> None:
+    # One connection per process, reopened once if the server dropped it.
+    global _notify_conn
+    import psycopg
+
+    with _notify_lock:
+        for attempt in range(2):
+            if _notify_conn is None or _notify_conn.closed:
+                _notify_conn = psycopg.connect(dsn, autocommit=True, connect_timeout=5)
+            try:
+                _notify_conn.execute("SELECT pg_notify(%s, %s)", (CHANNEL, stage))
+                return
+            except psycopg.OperationalError:
+                _notify_conn.close()
+                _notify_conn = None
+                if attempt:
+                    raise
+
+
+def stage_done(stage: str, count: int) -> None:
+    # Wakes the next stage when this one produced work for it.
+    if count > 0 and stage in NEXT_STAGE:
+        notify(NEXT_STAGE[stage])
+
+
+def _listen(dsn: str) -> None:
+    try:
+        import psycopg
+    except ImportError:
+        return
+    while True:
+        try:
+            with psycopg.connect(dsn, autocommit=True) as conn:
+                conn.execute(f"LISTEN {CHANNEL}")
+                _listening.set()
+                for note in conn.notifies():
+                    if note.payload in NEXT_STAGE.values():
+                        _event(note.payload).set()
+        except Exception:
+            _listening.clear()
+            time.sleep(30)
+
+
+def _ensure_listener() -> None:
+    global _listener
+    dsn = get_settings().database_url
+    if not dsn:
+        return
+    with _events_lock:
+        if _listener is None:
+            _listener = threading.Thread(target=_listen, args=(dsn,), name="stage-listen", daemon=True)
+            _listener.start()
+
+
+def wait_for(stage: str, timeout: float) -> bool:
+    # Returns True when woken by an upstream stage, False when the polling interval ran out.
+    _ensure_listener()
+    event = _event(stage)
+    woke = event.wait(timeout)
+    event.clear()
+    return woke
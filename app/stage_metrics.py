@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator
+
+COUNTERS = ("items", "http_calls", "llm_calls", "tokens_in", "tokens_out", "errors")
+
+# The stage being measured and the run collecting finished stages; HTTP and LLM calls
+# attribute themselves to whatever stage is current in their context.
+_stage: contextvars.ContextVar[dict | None] = contextvars.ContextVar("pipeline_stage", default=None)
+_run: contextvars.ContextVar[list[dict] | None] = contextvars.ContextVar("pipeline_run", default=None)
+_lock = threading.Lock()
+
+
+@contextmanager
+def collect() -> Iterator[list[dict]]:
+    stages: list[dict] = []
+    token = _run.set(stages)
+    try:
+        yield stages
+    finally:
+        _run.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[dict]:
+    row: dict[str, Any] = {"stage": name, "started_at": datetime.now(timezone.utc).isoformat(), "duration_ms": 0}
+    row.update({key: 0 for key in COUNTERS})
+    stages = _run.get()
+    if stages is not None:
+        stages.append(row)
+    token = _stage.set(row)
+    started = time.perf_counter()
+    try:
+        yield row
+    except Exception:
+        _add(row, errors=1)
+        raise
+    finally:
+        row["duration_ms"] = int((time.perf_counter() - started) * 1000)
+        _stage.reset(token)
+
+
+def _add(row: dict, **values: int) -> None:
+    # Stage rows are shared with pool threads via copied contexts.
+    with _lock:
+        for key, value in values.items():
+            row[key] += value
+
+
+def record_http(error: bool = False) -> None:
+    row = _stage.get()
+    if row is not None:
+        _add(row, http_calls=1, errors=1 if error else 0)
+
+
+def record_llm_call() -> None:
+    row = _stage.get()
+    if row is not None:
+        _add(row, llm_calls=1)
+
+
+def record_tokens(usage: dict | None) -> None:
+    row = _stage.get()
+    if row is None or not usage:
+        return
+    _add(
+        row,
+        tokens_in=int(usage.get("prompt_tokens") or usage.get("input_tokens") or 0),
+        tokens_out=int(usage.get("completion_tokens") or usage.get("output_tokens") or 0),
+    )
+
+
+def submit(pool: Executor, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    # Pool threads do not inherit contextvars; run each task in a copy of the caller's context.
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
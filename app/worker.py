@@ -1,4 +1,6 @@
 import argparse
+import sys
+import threading
 import time
 
 from pathlib import Path
@@ -36,6 +38,19 @@ from .pipeline import (
     run_second_judge,
     update_post_media,
 )
+from .stage_events import wait_for
+
+
+def _stage_loop(stage: str, run, label: str, interval: int) -> None:
+    # Runs as soon as the upstream stage reports new work; the interval is only the polling fallback.
+    while True:
+        try:
+            count = run()
+            print(f"{label}={count}")
+        except Exception as exc:
+            # One failed pass must not end the loop; retry after the next wakeup or interval.
+            print(f"{label}=error error={type(exc).__name__}: {exc}")
+        wait_for(stage, interval)
 
 
 def run_scrape_sources(project_id: str | None = None, max_items: int = 10) -> dict:
@@ -74,7 +89,7 @@ def main() -> None:
     scrape_parser.add_argument("--project-id", type=str, default=None, help="Project ID filter")
     scrape_parser.add_argument("--max-items", type=int, default=10, help="Max items per source")
     ingest_sources = sub.add_parser("ingest-sources", help="Ingest source items into articles")
-    ingest_sources.add_argument("--limit", type=int, default=20, help="Max source items to ingest")
+    ingest_sources.add_argument("--limit", type=int, default=20, help="Source items per ingest batch")
     ingest_sources.add_argument("--project-id", type=str, default=None, help="Project ID filter")
     ingest_sources.add_argument(
         "--no-fetch", action="store_true", help="Use stored excerpts without fetching full pages"
@@ -163,6 +178,7 @@ def main() -> None:
         action="store_true",
         help="Skip wiping unusable article content",
     )
+    cleanup_parser.add_argument("--batch-size", type=int, default=500, help="Rows per cleanup batch")
 
     loop_parser = sub.add_parser("scrape-loop", help="Scrape on an interval")
     loop_parser.add_argument("--interval", type=int, default=3600, help="Seconds between runs")
@@ -181,6 +197,9 @@ def main() -> None:
     second_loop = sub.add_parser("second-judge-loop", help="Second judge on an interval")
     second_loop.add_argument("--interval", type=int, default=1800, help="Seconds between runs")
 
+    stages_loop = sub.add_parser("stages-loop", help="Extract, judge, generate and second judge in one process")
+    stages_loop.add_argument("--interval", type=int, default=1800, help="Max seconds between runs per stage")
+
     args = parser.parse_args()
 
     if args.command == "scrape":
@@ -388,12 +407,19 @@ def main() -> None:
         else:
             results = run_pipeline_all(max_items=args.max_items)
             print(f"pipeline_all count={len(results)}")
+            for row in results:
+                if row.get("error"):
+                    print(f"project={row['project_id']} status=error error={row['error']}")
         return
     if args.command == "cleanup":
         results = cleanup_old_data(
             hours=args.hours,
             delete_legacy=not args.no_legacy,
             wipe_unusable=not args.no_wipe,
+            batch_size=args.batch_size,
+            progress=lambda table, stats: print(
+                f"cleanup_progress table={table} " + " ".join(f"{k}={v}" for k, v in stats.items())
+            ),
         )
         print("cleanup=" + ",".join([f"{k}={v}" for k, v in results.items()]))
         return
@@ -405,28 +431,39 @@ def main() -> None:
             time.sleep(args.interval)
 
     if args.command == "extract-loop":
-        while True:
-            count = run_extraction()
-            print(f"extracted={count}")
-            time.sleep(args.interval)
+        _stage_loop("extract", run_extraction, "extracted", args.interval)
 
     if args.command == "judge-loop":
-        while True:
-            count = run_first_judge()
-            print(f"judged={count}")
-            time.sleep(args.interval)
+        _stage_loop("judge", run_first_judge, "judged", args.interval)
 
     if args.command == "generate-loop":
-        while True:
-            count = run_generation()
-            print(f"generated_posts={count}")
-            time.sleep(args.interval)
+        _stage_loop("generate", run_generation, "generated_posts", args.interval)
 
     if args.command == "second-judge-loop":
-        while True:
-            count = run_second_judge()
-            print(f"second_judged={count}")
-            time.sleep(args.interval)
+        _stage_loop("second_judge", run_second_judge, "second_judged", args.interval)
+
+    if args.command == "stages-loop":
+        # Shared process: stage handoff goes through in-process events, no database needed.
+        stages = [
+            ("extract", run_extraction, "extracted"),
+            ("judge", run_first_judge, "judged"),
+            ("generate", run_generation, "generated_posts"),
+            ("second_judge", run_second_judge, "second_judged"),
+        ]
+        threads = [
+            threading.Thread(
+                target=_stage_loop, args=(stage, run, label, args.interval), name=f"{stage}-loop", daemon=True
+            )
+            for stage, run, label in stages
+        ]
+        for thread in threads:
+            thread.start()
+        # Exit non-zero if any stage thread dies so the service manager restarts the process.
+        while all(thread.is_alive() for thread in threads):
+            time.sleep(5)
+        dead = [thread.name for thread in threads if not thread.is_alive()]
+        print(f"stages_loop=stopped dead={','.join(dead)}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
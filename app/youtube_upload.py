@@ -18,6 +18,7 @@ from app.media.roundup_video import (
     render_audio_roundup_video,
 )
 from app.pipeline import fetch_latest_audio_roundup_for_project
+from app.project_cache import get_project
 
 
 def _now_iso() -> str:
@@ -55,29 +56,13 @@ def _credentials(refresh_token: str, scopes: list[str]) -> Credentials:
 
 
 def _project_language(project_id: str) -> str | None:
-    sb = get_supabase()
-    resp = (
-        sb.table("projects")
-        .select("language")
-        .eq("id", project_id)
-        .limit(1)
-        .execute()
-    )
-    data = resp.data or []
-    return data[0].get("language") if data else None
+    row = get_project(project_id)
+    return row.get("language") if row else None
 
 
 def _project_name(project_id: str) -> str:
-    sb = get_supabase()
-    resp = (
-        sb.table("projects")
-        .select("name")
-        .eq("id", project_id)
-        .limit(1)
-        .execute()
-    )
-    data = resp.data or []
-    return data[0].get("name") or "Daily Roundup" if data else "Daily Roundup"
+    row = get_project(project_id)
+    return row.get("name") or "Daily Roundup" if row else "Daily Roundup"
 
 
 def _normalize_tags(value: Any) -> list[str]:
@@ -159,45 +159,12 @@ def _fetch_analytics_stats(
     }
 
 
-def _resolve_project_ids(posts: list[dict]) -> dict[str, str | None]:
-    sb = get_supabase()
-    post_ids = [p["id"] for p in posts if p.get("id")]
-    if not post_ids:
-        return {}
-    usage = (
-        sb.table("article_usage")
-        .select("post_id, article_id")
-        .in_("post_id", post_ids)
-        .execute()
-        .data
-        or []
-    )
-    article_ids = list({u.get("article_id") for u in usage if u.get("article_id")})
-    if not article_ids:
-        return {}
-    articles = (
-        sb.table("articles")
-        .select("id, project_id")
-        .in_("id", article_ids)
-        .execute()
-        .data
-        or []
-    )
-    article_project = {a["id"]: a.get("project_id") for a in articles if a.get("id")}
-    post_project: dict[str, str | None] = {}
-    for row in usage:
-        post_id = row.get("post_id")
-        article_id = row.get("article_id")
-        if post_id and article_id:
-            post_project[post_id] = article_project.get(article_id)
-    return post_project
-
-
-def _list_posted_roundups(limit: int = 50) -> list[dict]:
+def _list_posted_roundups(project_id: str, limit: int = 50) -> list[dict]:
     sb = get_supabase()
     resp = (
         sb.table("posts")
         .select("id, post_url, posted_at, content, created_at")
+        .eq("project_id", project_id)
         .eq("content_type", "audio_roundup")
         .eq("posted", True)
         .order("posted_at", desc=True)
@@ -227,11 +194,7 @@ def fetch_youtube_video_metrics_for_project(project_id: str, max_posts: int = 50
     if "https://www.googleapis.com/auth/youtube.readonly" not in scopes:
         return {"status": "missing_scope"}
 
-    posts = _list_posted_roundups(limit=max_posts)
-    if not posts:
-        return {"status": "no_posts"}
-    post_project = _resolve_project_ids(posts)
-    posts = [p for p in posts if post_project.get(p["id"]) == project_id]
+    posts = _list_posted_roundups(project_id, limit=max_posts)
     if not posts:
         return {"status": "no_posts"}
 
@@ -0,0 +1,57 @@
+-- Leases so several workers can share the extract / judge / generate stages without duplicate LLM calls
+ALTER TABLE IF EXISTS articles
+  ADD COLUMN IF NOT EXISTS lease_owner TEXT;
+
+ALTER TABLE IF EXISTS articles
+  ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+
+COMMENT ON COLUMN articles.lease_owner IS 'Worker (host:pid) currently processing the article';
+COMMENT ON COLUMN articles.lease_expires_at IS 'Lease expiry; expired leases can be claimed by another worker';
+
+-- Function: Atomically lease a batch of articles for a pipeline stage ('extract', 'judge', 'generate')
+CREATE OR REPLACE FUNCTION claim_articles(
+  p_stage TEXT,
+  p_owner TEXT,
+  p_limit INTEGER DEFAULT 20,
+  p_project_id UUID DEFAULT NULL,
+  p_min_score INTEGER DEFAULT 0,
+  p_lease_seconds INTEGER DEFAULT 900
+)
+RETURNS SETOF articles AS $$
+  WITH picked AS (
+    SELECT a.id
+    FROM articles a
+    WHERE (p_project_id IS NULL OR a.project_id = p_project_id)
+      AND (a.lease_expires_at IS NULL OR a.lease_expires_at < NOW())
+      AND a.unusable = FALSE
+      AND a.duplicate_of IS NULL
+      AND (
+        (p_stage = 'extract' AND a.processed = FALSE)
+        OR (p_stage = 'judge' AND a.processed = TRUE AND a.scored = FALSE)
+        OR (
+          p_stage = 'generate'
+          AND a.scored = TRUE
+          AND a.judge_score >= p_min_score
+          AND COALESCE(a.content, '') <> ''
+          AND NOT EXISTS (
+            SELECT 1 FROM posts p
+            WHERE p.article_id = a.id AND p.content_type = 'video'
+          )
+        )
+      )
+    ORDER BY
+      CASE WHEN p_stage = 'generate' THEN a.judge_score END DESC NULLS LAST,
+      CASE WHEN p_stage = 'generate' THEN a.scraped_at END DESC NULLS LAST,
+      a.scraped_at ASC
+    LIMIT p_limit
+    FOR UPDATE SKIP LOCKED
+  )
+  UPDATE articles a
+  SET lease_owner = p_owner,
+      lease_expires_at = NOW() + make_interval(secs => p_lease_seconds)
+  FROM picked
+  WHERE a.id = picked.id
+  RETURNING a.*;
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION claim_articles IS 'Leases up to p_limit articles ready for a stage; rows locked or leased by another worker are skipped';
@@ -0,0 +1,11 @@
+-- Near-duplicate index: 64-bit SimHash per article plus 4 x 16-bit bands for LSH lookup
+ALTER TABLE IF EXISTS articles
+  ADD COLUMN IF NOT EXISTS simhash BIGINT;
+
+ALTER TABLE IF EXISTS articles
+  ADD COLUMN IF NOT EXISTS simhash_bands INTEGER[];
+
+COMMENT ON COLUMN articles.simhash IS 'SimHash of word 3-shingles (signed 64-bit) for near-duplicate detection';
+COMMENT ON COLUMN articles.simhash_bands IS 'SimHash split into bands (band_index << 16 | band_value); any shared band makes a candidate';
+
+CREATE INDEX IF NOT EXISTS idx_articles_simhash_bands ON articles USING GIN (simhash_bands);
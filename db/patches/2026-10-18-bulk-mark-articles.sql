@@ -0,0 +1,38 @@
+-- Function: Bulk write-back of extraction results (JSON array of {id, summary, title, content, content_hash})
+CREATE OR REPLACE FUNCTION bulk_mark_processed(p_items JSONB)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  UPDATE articles a
+  SET summary = i.summary,
+      title = COALESCE(NULLIF(i.title, ''), a.title),
+      content = COALESCE(NULLIF(i.content, ''), a.content),
+      content_hash = COALESCE(NULLIF(i.content_hash, ''), a.content_hash),
+      processed = TRUE,
+      scraped_at = NOW()
+  FROM jsonb_to_recordset(p_items) AS i(id UUID, summary TEXT, title TEXT, content TEXT, content_hash TEXT)
+  WHERE a.id = i.id;
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION bulk_mark_processed IS 'Marks a batch of articles processed with their extraction results in one call';
+
+-- Function: Bulk write-back of first judge results (JSON array of {id, judge_score, format_assignments})
+CREATE OR REPLACE FUNCTION bulk_mark_scored(p_items JSONB)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  UPDATE articles a
+  SET judge_score = i.judge_score,
+      format_assignments = COALESCE(i.format_assignments, '[]'::jsonb),
+      scored = TRUE
+  FROM jsonb_to_recordset(p_items) AS i(id UUID, judge_score INTEGER, format_assignments JSONB)
+  WHERE a.id = i.id;
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION bulk_mark_scored IS 'Marks a batch of articles scored with their first judge results in one call';
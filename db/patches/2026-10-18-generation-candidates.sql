@@ -0,0 +1,22 @@
+-- View: Generation candidates (scored, usable articles without a video post yet)
+CREATE OR REPLACE VIEW generation_candidates AS
+SELECT
+  a.id,
+  a.project_id,
+  a.content,
+  a.judge_score,
+  a.scraped_at
+FROM articles a
+WHERE a.scored = TRUE
+  AND a.unusable = FALSE
+  AND a.duplicate_of IS NULL
+  AND COALESCE(a.content, '') <> ''
+  AND NOT EXISTS (
+    SELECT 1 FROM posts p
+    WHERE p.article_id = a.id AND p.content_type = 'video'
+  );
+
+COMMENT ON VIEW generation_candidates IS 'Scored, usable articles that have no video post yet (anti-join for run_generation)';
+
+CREATE INDEX IF NOT EXISTS idx_articles_generation_order
+  ON articles(judge_score DESC, scraped_at DESC) WHERE scored = TRUE AND unusable = FALSE;
@@ -0,0 +1,21 @@
+-- Function: Apply a run's model performance tallies in one call
+-- p_deltas: JSON array of {model_name, content_type, wins, total}
+CREATE OR REPLACE FUNCTION update_model_performance_bulk(p_deltas JSONB)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  INSERT INTO model_performance (model_name, content_type, judge_wins, total_posts)
+  SELECT d.model_name, d.content_type, SUM(d.wins), SUM(d.total)
+  FROM jsonb_to_recordset(p_deltas) AS d(model_name TEXT, content_type TEXT, wins INTEGER, total INTEGER)
+  GROUP BY d.model_name, d.content_type
+  ON CONFLICT (model_name, content_type)
+  DO UPDATE SET
+    judge_wins = model_performance.judge_wins + EXCLUDED.judge_wins,
+    total_posts = model_performance.total_posts + EXCLUDED.total_posts,
+    last_updated = NOW();
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION update_model_performance_bulk IS 'Adds judge_wins/total_posts deltas for many (model, content_type) pairs atomically';
@@ -0,0 +1,5 @@
+-- Record why a project's pipeline run failed
+ALTER TABLE IF EXISTS pipeline_runs
+  ADD COLUMN IF NOT EXISTS error TEXT;
+
+COMMENT ON COLUMN pipeline_runs.error IS 'Exception message when status = error';
@@ -0,0 +1,8 @@
+-- Count LLM calls (extraction + first judge) skipped because duplicates were caught before extraction
+ALTER TABLE IF EXISTS pipeline_runs
+  ADD COLUMN IF NOT EXISTS llm_calls_avoided INTEGER DEFAULT 0;
+
+COMMENT ON COLUMN pipeline_runs.llm_calls_avoided IS 'Extraction + judge calls skipped by pre-extraction dedupe';
+
+CREATE INDEX IF NOT EXISTS idx_articles_unprocessed_project
+  ON articles(project_id) WHERE processed = FALSE AND unusable = FALSE AND duplicate_of IS NULL;
@@ -0,0 +1,20 @@
+-- Add pipeline_stage_runs for per-stage pipeline instrumentation
+CREATE TABLE IF NOT EXISTS pipeline_stage_runs (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  run_id UUID REFERENCES pipeline_runs(id) ON DELETE CASCADE,
+  project_id UUID REFERENCES projects(id) ON DELETE SET NULL,
+  stage TEXT NOT NULL,
+  items INTEGER DEFAULT 0,
+  duration_ms INTEGER DEFAULT 0,
+  http_calls INTEGER DEFAULT 0,
+  llm_calls INTEGER DEFAULT 0,
+  tokens_in INTEGER DEFAULT 0,
+  tokens_out INTEGER DEFAULT 0,
+  errors INTEGER DEFAULT 0,
+  started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_stage_runs_run_id ON pipeline_stage_runs(run_id);
+CREATE INDEX IF NOT EXISTS idx_pipeline_stage_runs_project_started ON pipeline_stage_runs(project_id, started_at DESC);
+
+COMMENT ON TABLE pipeline_stage_runs IS 'Wall time, HTTP/LLM calls, tokens and errors per stage of a pipeline run';
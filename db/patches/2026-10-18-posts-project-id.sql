@@ -0,0 +1,28 @@
+-- Store the owning project on posts so per-project roundup lookups are one indexed query
+ALTER TABLE IF EXISTS posts
+  ADD COLUMN IF NOT EXISTS project_id UUID REFERENCES projects(id) ON DELETE SET NULL;
+
+COMMENT ON COLUMN posts.project_id IS 'Owning project (denormalized from articles / article_usage)';
+
+-- Backfill: video posts from their article, roundups through article_usage
+UPDATE posts p
+SET project_id = a.project_id
+FROM articles a
+WHERE p.project_id IS NULL
+  AND p.article_id = a.id
+  AND a.project_id IS NOT NULL;
+
+UPDATE posts p
+SET project_id = src.project_id
+FROM (
+  SELECT DISTINCT ON (u.post_id) u.post_id, a.project_id
+  FROM article_usage u
+  JOIN articles a ON a.id = u.article_id
+  WHERE u.post_id IS NOT NULL AND a.project_id IS NOT NULL
+  ORDER BY u.post_id, u.used_at DESC
+) src
+WHERE p.project_id IS NULL
+  AND p.id = src.post_id;
+
+CREATE INDEX IF NOT EXISTS idx_posts_project_content_created
+  ON posts(project_id, content_type, created_at DESC);
@@ -0,0 +1,17 @@
+-- Mark every variant of a judged group so the second judge never re-reads it
+ALTER TABLE IF EXISTS posts
+  ADD COLUMN IF NOT EXISTS second_judged_at TIMESTAMP WITH TIME ZONE;
+
+COMMENT ON COLUMN posts.second_judged_at IS 'When the Second Judge decided this variant group (winner and losers)';
+
+UPDATE posts p
+SET second_judged_at = NOW()
+WHERE p.second_judged_at IS NULL
+  AND p.content_type = 'video'
+  AND EXISTS (
+    SELECT 1 FROM posts w
+    WHERE w.article_id = p.article_id AND w.content_type = 'video' AND w.selected = TRUE
+  );
+
+CREATE INDEX IF NOT EXISTS idx_posts_second_judge_pending
+  ON posts(created_at) WHERE content_type = 'video' AND selected = FALSE AND second_judged_at IS NULL;
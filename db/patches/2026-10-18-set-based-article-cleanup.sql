@@ -0,0 +1,60 @@
+-- Function: Mark old low-score articles of a project unusable in one statement
+CREATE OR REPLACE FUNCTION mark_project_low_score_unusable(
+  p_project_id UUID,
+  p_score_threshold INTEGER,
+  p_age_hours INTEGER
+)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  UPDATE articles
+  SET unusable = TRUE,
+      unusable_reason = 'low_score_age(score<' || p_score_threshold || ',>' || p_age_hours || 'h)',
+      unusable_at = NOW()
+  WHERE project_id = p_project_id
+    AND scored = TRUE
+    AND unusable = FALSE
+    AND judge_score < p_score_threshold
+    AND scraped_at < NOW() - make_interval(hours => p_age_hours);
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION mark_project_low_score_unusable IS 'Marks scored articles below the score threshold and older than the age limit unusable; returns rows updated';
+
+-- Function: Exact-hash dedupe for a project (keeps highest score, then newest)
+CREATE OR REPLACE FUNCTION dedupe_project_articles(p_project_id UUID)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  WITH ranked AS (
+    SELECT
+      id,
+      FIRST_VALUE(id) OVER w AS keep_id,
+      ROW_NUMBER() OVER w AS rn
+    FROM articles
+    WHERE project_id = p_project_id
+      AND unusable = FALSE
+      AND content_hash IS NOT NULL
+    WINDOW w AS (
+      PARTITION BY content_hash
+      ORDER BY COALESCE(judge_score, 0) DESC, scraped_at DESC NULLS LAST, id
+    )
+  )
+  UPDATE articles a
+  SET unusable = TRUE,
+      unusable_reason = 'duplicate',
+      duplicate_of = r.keep_id,
+      unusable_at = NOW()
+  FROM ranked r
+  WHERE a.id = r.id AND r.rn > 1;
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION dedupe_project_articles IS 'Marks all but the best article per content_hash in a project as duplicates; returns rows updated';
+
+CREATE INDEX IF NOT EXISTS idx_articles_project_content_hash
+  ON articles(project_id, content_hash) WHERE unusable = FALSE AND content_hash IS NOT NULL;
@@ -0,0 +1,9 @@
+-- Store HTTP validators per source for conditional GET (ETag / Last-Modified)
+ALTER TABLE IF EXISTS sources
+  ADD COLUMN IF NOT EXISTS http_etag TEXT;
+
+ALTER TABLE IF EXISTS sources
+  ADD COLUMN IF NOT EXISTS http_last_modified TEXT;
+
+COMMENT ON COLUMN sources.http_etag IS 'ETag from the last successful full fetch (sent as If-None-Match)';
+COMMENT ON COLUMN sources.http_last_modified IS 'Last-Modified from the last successful full fetch (sent as If-Modified-Since)';
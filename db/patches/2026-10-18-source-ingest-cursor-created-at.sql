@@ -0,0 +1,19 @@
+-- Key the per-source ingest cursor on source_items.created_at, which never changes;
+-- scraped_at is rewritten by every re-scrape upsert and let rows jump past the cursor.
+ALTER TABLE IF EXISTS source_items
+  ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+ALTER TABLE IF EXISTS sources
+  ADD COLUMN IF NOT EXISTS ingest_cursor_created_at TIMESTAMP WITH TIME ZONE;
+
+-- Old cursors point into scraped_at order; start each source over (existing URLs are skipped).
+UPDATE sources SET ingest_cursor_id = NULL;
+
+ALTER TABLE IF EXISTS sources
+  DROP COLUMN IF EXISTS ingest_cursor_scraped_at;
+
+DROP INDEX IF EXISTS idx_source_items_source_cursor;
+CREATE INDEX IF NOT EXISTS idx_source_items_source_cursor ON source_items(source_id, created_at, id);
+
+COMMENT ON COLUMN sources.ingest_cursor_created_at IS 'created_at of the last source_item consumed by ingest';
+COMMENT ON COLUMN sources.ingest_cursor_id IS 'id of the last source_item consumed by ingest (keyset tie-breaker)';
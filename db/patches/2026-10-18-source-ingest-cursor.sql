@@ -0,0 +1,11 @@
+-- Per-source ingest watermark: ingest reads source_items strictly after (scraped_at, id)
+ALTER TABLE IF EXISTS sources
+  ADD COLUMN IF NOT EXISTS ingest_cursor_scraped_at TIMESTAMP WITH TIME ZONE;
+
+ALTER TABLE IF EXISTS sources
+  ADD COLUMN IF NOT EXISTS ingest_cursor_id UUID;
+
+COMMENT ON COLUMN sources.ingest_cursor_scraped_at IS 'scraped_at of the last source_item consumed by ingest';
+COMMENT ON COLUMN sources.ingest_cursor_id IS 'id of the last source_item consumed by ingest (keyset tie-breaker)';
+
+CREATE INDEX IF NOT EXISTS idx_source_items_source_cursor ON source_items(source_id, scraped_at, id);
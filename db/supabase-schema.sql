@@ -20,6 +20,10 @@ CREATE TABLE IF NOT EXISTS articles (
   format_assignments JSONB DEFAULT '[]'::jsonb,
   content_hash TEXT,
   duplicate_of UUID REFERENCES articles(id) ON DELETE SET NULL,
+  simhash BIGINT,
+  simhash_bands INTEGER[],
+  lease_owner TEXT,
+  lease_expires_at TIMESTAMP WITH TIME ZONE,
   unusable BOOLEAN DEFAULT FALSE,
   unusable_reason TEXT,
   unusable_at TIMESTAMP WITH TIME ZONE,
@@ -55,6 +59,10 @@ COMMENT ON COLUMN articles.processed IS 'TRUE after extraction (summary generate
 COMMENT ON COLUMN articles.scored IS 'TRUE after first judge scoring';
 COMMENT ON COLUMN articles.content_hash IS 'Hash of normalized article content for dedupe';
 COMMENT ON COLUMN articles.duplicate_of IS 'Reference to canonical article when deduped';
+COMMENT ON COLUMN articles.simhash IS 'SimHash of word 3-shingles (signed 64-bit) for near-duplicate detection';
+COMMENT ON COLUMN articles.simhash_bands IS 'SimHash split into bands (band_index << 16 | band_value); any shared band makes a candidate';
+COMMENT ON COLUMN articles.lease_owner IS 'Worker (host:pid) currently processing the article';
+COMMENT ON COLUMN articles.lease_expires_at IS 'Lease expiry; expired leases can be claimed by another worker';
 COMMENT ON COLUMN articles.unusable IS 'TRUE if content is too old/low score/duplicate';
 COMMENT ON COLUMN articles.unusable_reason IS 'Reason for marking unusable';
 
@@ -128,6 +136,7 @@ COMMENT ON COLUMN article_urls.scraped IS 'TRUE after full article HTML is colle
 CREATE TABLE IF NOT EXISTS posts (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   article_id UUID REFERENCES articles(id) ON DELETE CASCADE,
+  project_id UUID REFERENCES projects(id) ON DELETE SET NULL,
   platform TEXT NOT NULL,
   content_type TEXT NOT NULL,
   generating_model TEXT NOT NULL,
@@ -141,6 +150,7 @@ CREATE TABLE IF NOT EXISTS posts (
   podcast_posted BOOLEAN DEFAULT FALSE,
   podcast_published_at TIMESTAMP WITH TIME ZONE,
   podcast_url TEXT,
+  second_judged_at TIMESTAMP WITH TIME ZONE,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -168,6 +178,7 @@ CREATE INDEX IF NOT EXISTS idx_posts_generating_model
 
 -- Comments for documentation
 COMMENT ON TABLE posts IS 'Stores AI-generated social media content (3 versions per article per format)';
+COMMENT ON COLUMN posts.project_id IS 'Owning project (denormalized from articles / article_usage)';
 COMMENT ON COLUMN posts.platform IS 'Target platform: instagram, facebook, tiktok, youtube';
 COMMENT ON COLUMN posts.content_type IS 'Format: headline, carousel, video, podcast';
 COMMENT ON COLUMN posts.generating_model IS 'AI model: gpt-5-mini, claude-haiku-4.5, gemini-2.5-flash';
@@ -291,6 +302,10 @@ CREATE TABLE IF NOT EXISTS sources (
   scrape_interval_hours INTEGER DEFAULT 6,
   last_scraped_at TIMESTAMP WITH TIME ZONE,
   last_status TEXT,
+  http_etag TEXT,
+  http_last_modified TEXT,
+  ingest_cursor_created_at TIMESTAMP WITH TIME ZONE,
+  ingest_cursor_id UUID,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
   UNIQUE(project_id, url)
@@ -314,6 +329,7 @@ CREATE TABLE IF NOT EXISTS source_items (
   raw TEXT,
   published_at TIMESTAMP WITH TIME ZONE,
   scraped_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
   UNIQUE(source_id, url)
 );
 
@@ -350,6 +366,8 @@ CREATE TABLE IF NOT EXISTS pipeline_runs (
   judge_count INTEGER DEFAULT 0,
   dedupe_count INTEGER DEFAULT 0,
   unusable_count INTEGER DEFAULT 0,
+  llm_calls_avoided INTEGER DEFAULT 0,
+  error TEXT,
   started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
   finished_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -358,6 +376,30 @@ CREATE INDEX IF NOT EXISTS idx_pipeline_runs_project_id ON pipeline_runs(project
 CREATE INDEX IF NOT EXISTS idx_pipeline_runs_started_at ON pipeline_runs(started_at DESC);
 
 COMMENT ON TABLE pipeline_runs IS 'Per-project pipeline run metrics (scrape/ingest/extract/judge)';
+COMMENT ON COLUMN pipeline_runs.llm_calls_avoided IS 'Extraction + judge calls skipped by pre-extraction dedupe';
+COMMENT ON COLUMN pipeline_runs.error IS 'Exception message when status = error';
+
+-- TABLE 7C: pipeline_stage_runs
+-- Per-stage timing and call counts for each pipeline run
+CREATE TABLE IF NOT EXISTS pipeline_stage_runs (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  run_id UUID REFERENCES pipeline_runs(id) ON DELETE CASCADE,
+  project_id UUID REFERENCES projects(id) ON DELETE SET NULL,
+  stage TEXT NOT NULL,
+  items INTEGER DEFAULT 0,
+  duration_ms INTEGER DEFAULT 0,
+  http_calls INTEGER DEFAULT 0,
+  llm_calls INTEGER DEFAULT 0,
+  tokens_in INTEGER DEFAULT 0,
+  tokens_out INTEGER DEFAULT 0,
+  errors INTEGER DEFAULT 0,
+  started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_stage_runs_run_id ON pipeline_stage_runs(run_id);
+CREATE INDEX IF NOT EXISTS idx_pipeline_stage_runs_project_started ON pipeline_stage_runs(project_id, started_at DESC);
+
+COMMENT ON TABLE pipeline_stage_runs IS 'Wall time, HTTP/LLM calls, tokens and errors per stage of a pipeline run';
 
 -- TABLE 8: youtube_accounts
 -- Stores OAuth refresh tokens per project (server-side use only)
@@ -491,8 +533,35 @@ ALTER TABLE IF EXISTS articles
 ALTER TABLE IF EXISTS articles
   ADD COLUMN IF NOT EXISTS unusable_at TIMESTAMP WITH TIME ZONE;
 
+ALTER TABLE IF EXISTS articles
+  ADD COLUMN IF NOT EXISTS simhash BIGINT;
+
+ALTER TABLE IF EXISTS articles
+  ADD COLUMN IF NOT EXISTS simhash_bands INTEGER[];
+
+ALTER TABLE IF EXISTS articles
+  ADD COLUMN IF NOT EXISTS lease_owner TEXT;
+
+ALTER TABLE IF EXISTS articles
+  ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+
+ALTER TABLE IF EXISTS pipeline_runs
+  ADD COLUMN IF NOT EXISTS llm_calls_avoided INTEGER DEFAULT 0;
+
+ALTER TABLE IF EXISTS pipeline_runs
+  ADD COLUMN IF NOT EXISTS error TEXT;
+
+ALTER TABLE IF EXISTS source_items
+  ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
 DO $$
 BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'source_items' AND column_name = 'created_at'
+  ) THEN
+    CREATE INDEX IF NOT EXISTS idx_source_items_source_cursor ON source_items(source_id, created_at, id);
+  END IF;
   IF EXISTS (
     SELECT 1 FROM information_schema.columns
     WHERE table_name = 'articles' AND column_name = 'project_id'
@@ -516,6 +585,42 @@ BEGIN
     WHERE table_name = 'articles' AND column_name = 'unusable'
   ) THEN
     CREATE INDEX IF NOT EXISTS idx_articles_unusable ON articles(unusable) WHERE unusable = TRUE;
+    CREATE INDEX IF NOT EXISTS idx_articles_generation_order
+      ON articles(judge_score DESC, scraped_at DESC) WHERE scored = TRUE AND unusable = FALSE;
+  END IF;
+  IF (
+    SELECT COUNT(*) FROM information_schema.columns
+    WHERE table_name = 'articles' AND column_name IN ('project_id', 'content_hash', 'unusable')
+  ) = 3 THEN
+    CREATE INDEX IF NOT EXISTS idx_articles_project_content_hash
+      ON articles(project_id, content_hash) WHERE unusable = FALSE AND content_hash IS NOT NULL;
+  END IF;
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'articles' AND column_name = 'simhash_bands'
+  ) THEN
+    CREATE INDEX IF NOT EXISTS idx_articles_simhash_bands ON articles USING GIN (simhash_bands);
+  END IF;
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'articles' AND column_name = 'duplicate_of'
+  ) THEN
+    CREATE INDEX IF NOT EXISTS idx_articles_unprocessed_project
+      ON articles(project_id) WHERE processed = FALSE AND unusable = FALSE AND duplicate_of IS NULL;
+  END IF;
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'posts' AND column_name = 'project_id'
+  ) THEN
+    CREATE INDEX IF NOT EXISTS idx_posts_project_content_created
+      ON posts(project_id, content_type, created_at DESC);
+  END IF;
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'posts' AND column_name = 'second_judged_at'
+  ) THEN
+    CREATE INDEX IF NOT EXISTS idx_posts_second_judge_pending
+      ON posts(created_at) WHERE content_type = 'video' AND selected = FALSE AND second_judged_at IS NULL;
   END IF;
 END $$;
 
@@ -525,6 +630,18 @@ ALTER TABLE IF EXISTS projects
 ALTER TABLE IF EXISTS sources
   ADD COLUMN IF NOT EXISTS scrape_interval_hours INTEGER DEFAULT 6;
 
+ALTER TABLE IF EXISTS sources
+  ADD COLUMN IF NOT EXISTS http_etag TEXT;
+
+ALTER TABLE IF EXISTS sources
+  ADD COLUMN IF NOT EXISTS http_last_modified TEXT;
+
+ALTER TABLE IF EXISTS sources
+  ADD COLUMN IF NOT EXISTS ingest_cursor_created_at TIMESTAMP WITH TIME ZONE;
+
+ALTER TABLE IF EXISTS sources
+  ADD COLUMN IF NOT EXISTS ingest_cursor_id UUID;
+
 ALTER TABLE IF EXISTS posts
   ADD COLUMN IF NOT EXISTS podcast_posted BOOLEAN DEFAULT FALSE;
 
@@ -534,6 +651,12 @@ ALTER TABLE IF EXISTS posts
 ALTER TABLE IF EXISTS posts
   ADD COLUMN IF NOT EXISTS podcast_url TEXT;
 
+ALTER TABLE IF EXISTS posts
+  ADD COLUMN IF NOT EXISTS second_judged_at TIMESTAMP WITH TIME ZONE;
+
+ALTER TABLE IF EXISTS posts
+  ADD COLUMN IF NOT EXISTS project_id UUID REFERENCES projects(id) ON DELETE SET NULL;
+
 -- ============================================================
 -- HELPER VIEWS (Optional but useful)
 -- ============================================================
@@ -567,6 +690,26 @@ ORDER BY scraped_at ASC;
 
 COMMENT ON VIEW unscored_articles IS 'Articles waiting for First Judge scoring (processed = TRUE, scored = FALSE)';
 
+-- View: Generation candidates (scored, usable articles without a video post yet)
+CREATE OR REPLACE VIEW generation_candidates AS
+SELECT
+  a.id,
+  a.project_id,
+  a.content,
+  a.judge_score,
+  a.scraped_at
+FROM articles a
+WHERE a.scored = TRUE
+  AND a.unusable = FALSE
+  AND a.duplicate_of IS NULL
+  AND COALESCE(a.content, '') <> ''
+  AND NOT EXISTS (
+    SELECT 1 FROM posts p
+    WHERE p.article_id = a.id AND p.content_type = 'video'
+  );
+
+COMMENT ON VIEW generation_candidates IS 'Scored, usable articles that have no video post yet (anti-join for run_generation)';
+
 -- View: Publishing queue
 CREATE OR REPLACE VIEW publishing_queue AS
 SELECT
@@ -638,6 +781,28 @@ $$ LANGUAGE plpgsql;
 
 COMMENT ON FUNCTION update_model_performance IS 'Increments judge_wins and total_posts for a model after Second Judge selection';
 
+-- Function: Apply a run's model performance tallies in one call
+-- p_deltas: JSON array of {model_name, content_type, wins, total}
+CREATE OR REPLACE FUNCTION update_model_performance_bulk(p_deltas JSONB)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  INSERT INTO model_performance (model_name, content_type, judge_wins, total_posts)
+  SELECT d.model_name, d.content_type, SUM(d.wins), SUM(d.total)
+  FROM jsonb_to_recordset(p_deltas) AS d(model_name TEXT, content_type TEXT, wins INTEGER, total INTEGER)
+  GROUP BY d.model_name, d.content_type
+  ON CONFLICT (model_name, content_type)
+  DO UPDATE SET
+    judge_wins = model_performance.judge_wins + EXCLUDED.judge_wins,
+    total_posts = model_performance.total_posts + EXCLUDED.total_posts,
+    last_updated = NOW();
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION update_model_performance_bulk IS 'Adds judge_wins/total_posts deltas for many (model, content_type) pairs atomically';
+
 -- Function: Next TTS combo index (atomic)
 CREATE OR REPLACE FUNCTION next_tts_combo(p_mod INTEGER DEFAULT 9)
 RETURNS INTEGER AS $$
@@ -663,6 +828,151 @@ $$ LANGUAGE plpgsql;
 
 COMMENT ON FUNCTION next_tts_combo IS 'Atomically increments TTS rotation counter and returns index modulo p_mod';
 
+-- Function: Bulk write-back of extraction results (JSON array of {id, summary, title, content, content_hash})
+CREATE OR REPLACE FUNCTION bulk_mark_processed(p_items JSONB)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  UPDATE articles a
+  SET summary = i.summary,
+      title = COALESCE(NULLIF(i.title, ''), a.title),
+      content = COALESCE(NULLIF(i.content, ''), a.content),
+      content_hash = COALESCE(NULLIF(i.content_hash, ''), a.content_hash),
+      processed = TRUE,
+      scraped_at = NOW()
+  FROM jsonb_to_recordset(p_items) AS i(id UUID, summary TEXT, title TEXT, content TEXT, content_hash TEXT)
+  WHERE a.id = i.id;
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION bulk_mark_processed IS 'Marks a batch of articles processed with their extraction results in one call';
+
+-- Function: Bulk write-back of first judge results (JSON array of {id, judge_score, format_assignments})
+CREATE OR REPLACE FUNCTION bulk_mark_scored(p_items JSONB)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  UPDATE articles a
+  SET judge_score = i.judge_score,
+      format_assignments = COALESCE(i.format_assignments, '[]'::jsonb),
+      scored = TRUE
+  FROM jsonb_to_recordset(p_items) AS i(id UUID, judge_score INTEGER, format_assignments JSONB)
+  WHERE a.id = i.id;
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION bulk_mark_scored IS 'Marks a batch of articles scored with their first judge results in one call';
+
+-- Function: Atomically lease a batch of articles for a pipeline stage ('extract', 'judge', 'generate')
+CREATE OR REPLACE FUNCTION claim_articles(
+  p_stage TEXT,
+  p_owner TEXT,
+  p_limit INTEGER DEFAULT 20,
+  p_project_id UUID DEFAULT NULL,
+  p_min_score INTEGER DEFAULT 0,
+  p_lease_seconds INTEGER DEFAULT 900
+)
+RETURNS SETOF articles AS $$
+  WITH picked AS (
+    SELECT a.id
+    FROM articles a
+    WHERE (p_project_id IS NULL OR a.project_id = p_project_id)
+      AND (a.lease_expires_at IS NULL OR a.lease_expires_at < NOW())
+      AND a.unusable = FALSE
+      AND a.duplicate_of IS NULL
+      AND (
+        (p_stage = 'extract' AND a.processed = FALSE)
+        OR (p_stage = 'judge' AND a.processed = TRUE AND a.scored = FALSE)
+        OR (
+          p_stage = 'generate'
+          AND a.scored = TRUE
+          AND a.judge_score >= p_min_score
+          AND COALESCE(a.content, '') <> ''
+          AND NOT EXISTS (
+            SELECT 1 FROM posts p
+            WHERE p.article_id = a.id AND p.content_type = 'video'
+          )
+        )
+      )
+    ORDER BY
+      CASE WHEN p_stage = 'generate' THEN a.judge_score END DESC NULLS LAST,
+      CASE WHEN p_stage = 'generate' THEN a.scraped_at END DESC NULLS LAST,
+      a.scraped_at ASC
+    LIMIT p_limit
+    FOR UPDATE SKIP LOCKED
+  )
+  UPDATE articles a
+  SET lease_owner = p_owner,
+      lease_expires_at = NOW() + make_interval(secs => p_lease_seconds)
+  FROM picked
+  WHERE a.id = picked.id
+  RETURNING a.*;
+$$ LANGUAGE sql;
+
+COMMENT ON FUNCTION claim_articles IS 'Leases up to p_limit articles ready for a stage; rows locked or leased by another worker are skipped';
+
+-- Function: Mark old low-score articles of a project unusable in one statement
+CREATE OR REPLACE FUNCTION mark_project_low_score_unusable(
+  p_project_id UUID,
+  p_score_threshold INTEGER,
+  p_age_hours INTEGER
+)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  UPDATE articles
+  SET unusable = TRUE,
+      unusable_reason = 'low_score_age(score<' || p_score_threshold || ',>' || p_age_hours || 'h)',
+      unusable_at = NOW()
+  WHERE project_id = p_project_id
+    AND scored = TRUE
+    AND unusable = FALSE
+    AND judge_score < p_score_threshold
+    AND scraped_at < NOW() - make_interval(hours => p_age_hours);
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION mark_project_low_score_unusable IS 'Marks scored articles below the score threshold and older than the age limit unusable; returns rows updated';
+
+-- Function: Exact-hash dedupe for a project (keeps highest score, then newest)
+CREATE OR REPLACE FUNCTION dedupe_project_articles(p_project_id UUID)
+RETURNS INTEGER AS $$
+DECLARE updated_count INTEGER;
+BEGIN
+  WITH ranked AS (
+    SELECT
+      id,
+      FIRST_VALUE(id) OVER w AS keep_id,
+      ROW_NUMBER() OVER w AS rn
+    FROM articles
+    WHERE project_id = p_project_id
+      AND unusable = FALSE
+      AND content_hash IS NOT NULL
+    WINDOW w AS (
+      PARTITION BY content_hash
+      ORDER BY COALESCE(judge_score, 0) DESC, scraped_at DESC NULLS LAST, id
+    )
+  )
+  UPDATE articles a
+  SET unusable = TRUE,
+      unusable_reason = 'duplicate',
+      duplicate_of = r.keep_id,
+      unusable_at = NOW()
+  FROM ranked r
+  WHERE a.id = r.id AND r.rn > 1;
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION dedupe_project_articles IS 'Marks all but the best article per content_hash in a project as duplicates; returns rows updated';
+
 -- ============================================================
 -- SAMPLE DATA (Optional - for testing)
 -- ============================================================
@@ -762,11 +1072,13 @@ ORDER BY tablename, indexname;
 /*
 DROP VIEW IF EXISTS unprocessed_articles;
 DROP VIEW IF EXISTS unscored_articles;
+DROP VIEW IF EXISTS generation_candidates;
 DROP VIEW IF EXISTS publishing_queue;
 DROP VIEW IF EXISTS model_leaderboard;
 
 DROP FUNCTION IF EXISTS get_queue_size();
 DROP FUNCTION IF EXISTS update_model_performance(TEXT, TEXT, BOOLEAN);
+DROP FUNCTION IF EXISTS update_model_performance_bulk(JSONB);
 
 DROP TABLE IF EXISTS performance_metrics CASCADE;
 DROP TABLE IF EXISTS model_performance CASCADE;
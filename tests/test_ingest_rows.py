@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from app.admin import _build_article_rows, _insert_articles_bulk, _mark_exact_duplicates
+from app.near_dupe import annotate_rows
+
+
+class FakeQuery:
+    def __init__(self, client):
+        self.client = client
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def upsert(self, json, **kwargs):
+        self.client.upserts.append((json, kwargs))
+        return self
+
+    def execute(self):
+        data = self.client.upserts[-1][0] if self.client.upserts else []
+        return SimpleNamespace(data=data, count=None)
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.upserts = []
+
+    def table(self, name):
+        return FakeQuery(self)
+
+
+def _text(extra=""):
+    words = " ".join(f"word{i * 7 % 31} term{i}" for i in range(300))
+    return f"{words} {extra}".strip()
+
+
+def test_mixed_duplicate_batch_upserts_uniform_rows():
+    sb = FakeSupabase()
+    pending = [
+        ("https://a.example/1", {"content": _text()}),
+        ("https://a.example/2", {"content": _text()}),
+        ("https://a.example/3", {"content": _text("tail")}),
+        ("https://a.example/4", {"content": "short text"}),
+    ]
+    settings = SimpleNamespace(extraction_max_chars=20000)
+    rows = _build_article_rows(sb, settings, pending, {}, {})
+    _mark_exact_duplicates(sb, rows)
+    annotate_rows(sb, rows)
+    sb.upserts.clear()
+    _insert_articles_bulk(sb, rows)
+
+    payload, kwargs = sb.upserts[0]
+    assert kwargs.get("default_to_null") is False
+    assert len({frozenset(row) for row in payload}) == 1
+    canonical, exact, near, short = payload
+    assert canonical["unusable"] is False and canonical["duplicate_of"] is None
+    assert short["unusable"] is False and short["duplicate_of"] is None
+    assert exact["unusable"] is True and exact["duplicate_of"] == canonical["id"]
+    assert near["unusable"] is True and near["duplicate_of"] == canonical["id"]
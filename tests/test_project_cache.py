@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app import project_cache
+
+
+class FakeQuery:
+    def __init__(self, client):
+        self.client = client
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self.client.reads += 1
+        return SimpleNamespace(data=[{"id": "p1", "config": {"tone": "dry"}}])
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.reads = 0
+
+    def table(self, name):
+        return FakeQuery(self)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    sb = FakeSupabase()
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(project_cache, "get_supabase", lambda: sb)
+    monkeypatch.setattr(project_cache, "get_settings", lambda: SimpleNamespace(project_cache_ttl_seconds=60))
+    monkeypatch.setattr(project_cache.time, "monotonic", lambda: clock.now)
+    project_cache.invalidate_project()
+    yield sb, clock
+    project_cache.invalidate_project()
+
+
+def test_hit_returns_a_copy(cache):
+    sb, _ = cache
+    first = project_cache.get_project("p1")
+    first["config"]["tone"] = "loud"
+    second = project_cache.get_project("p1")
+    assert sb.reads == 1
+    assert second["config"]["tone"] == "dry"
+
+
+def test_entry_expires_after_ttl(cache):
+    sb, clock = cache
+    project_cache.get_project("p1")
+    clock.now += 59
+    project_cache.get_project("p1")
+    assert sb.reads == 1
+    clock.now += 2
+    project_cache.get_project("p1")
+    assert sb.reads == 2
+
+
+def test_invalidate_project(cache):
+    sb, _ = cache
+    project_cache.get_project("p1")
+    project_cache.invalidate_project("p1")
+    project_cache.get_project("p1")
+    assert sb.reads == 2